@@ -0,0 +1,103 @@
+import uuid
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from common.permissions.principal import Principal
+from user.types import UserRole
+
+
+class ClaimsTokenUser(TokenUser):
+    """
+    Account of a request built from the claims of its access token, without
+    touching the database
+    """
+
+    @cached_property
+    def principal(self) -> Principal:
+        return Principal.from_payload(self.token.payload)
+
+    @property
+    def user_id(self) -> Optional[uuid.UUID]:
+        return self.principal.user_id
+
+    @property
+    def role(self) -> UserRole:
+        return self.principal.role
+
+    @property
+    def school_id(self) -> Optional[str]:
+        return self.principal.school_id
+
+    @property
+    def locale_code(self) -> Optional[str]:
+        return self.principal.locale_code
+
+
+class AccountRevocationCache:
+    """
+    Short lived cache of account activity, so deactivated accounts are rejected
+    within the timeout without a query per request
+    """
+
+    KEY_PREFIX = "account_is_active"
+
+    def __init__(self):
+        config = getattr(settings, "STATELESS_AUTHENTICATION", {})
+        self.enabled = config.get("REVOCATION_CHECK", True)
+        self.cache_alias = config.get("REVOCATION_CACHE_ALIAS", "default")
+        self.timeout = config.get("REVOCATION_CACHE_TIMEOUT", 60)
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def _key(self, account_id) -> str:
+        return f"{self.KEY_PREFIX}:{account_id}"
+
+    def is_active(self, account_id) -> bool:
+        if not self.enabled:
+            return True
+        key = self._key(account_id)
+        is_active = self.cache.get(key, None)
+        if is_active is None:
+            from authy.models import Account  # Import here to avoid circular imports
+
+            is_active = bool(
+                Account.objects.filter(id=account_id, deleted_at__isnull=True)
+                .values_list("is_active", flat=True)
+                .first()
+            )
+            self.cache.set(key, is_active, timeout=self.timeout)
+        return is_active
+
+    def invalidate(self, account_id):
+        self.cache.delete(self._key(account_id))
+
+
+account_revocation_cache = AccountRevocationCache()
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the claims of a valid access token instead of
+    loading the account, deactivated accounts are rejected through the
+    revocation cache
+    """
+
+    def get_user(self, validated_token):
+        account_id = validated_token.get(api_settings.USER_ID_CLAIM, None)
+        if account_id is None:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if not account_revocation_cache.is_active(account_id):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return ClaimsTokenUser(validated_token)
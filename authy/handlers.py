@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.contrib.auth.models import update_last_login
+from django.contrib.auth.signals import user_logged_in
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from authy.authentication import account_revocation_cache
+from authy.helpers.login_pipeline import deferred_update_last_login
+from authy.models import Account
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def handle_account_change(sender, instance, **kwargs):
+    # Drop again after commit since other requests may cache the old state before it
+    account_revocation_cache.invalidate(instance.id)
+    transaction.on_commit(lambda: account_revocation_cache.invalidate(instance.id))
+
+
+if getattr(settings, "LOGIN_PIPELINE", {}).get("DEFER_LAST_LOGIN_UPDATE", True):
+    user_logged_in.disconnect(update_last_login, dispatch_uid="update_last_login")
+    user_logged_in.connect(
+        deferred_update_last_login, dispatch_uid="deferred_update_last_login"
+    )
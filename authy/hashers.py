@@ -0,0 +1,46 @@
+from typing import Dict
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+def get_hasher_options(name: str) -> Dict:
+    return getattr(settings, "PASSWORD_HASHING", {}).get(name, {})
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """
+    Scrypt with the cost from PASSWORD_HASHING["SCRYPT"]
+    """
+
+    def __init__(self):
+        options = get_hasher_options("SCRYPT")
+        self.work_factor = options.get("WORK_FACTOR", self.work_factor)
+        self.block_size = options.get("BLOCK_SIZE", self.block_size)
+        self.parallelism = options.get("PARALLELISM", self.parallelism)
+        # OpenSSL refuses more than 32MB unless allowed, scrypt uses 128 * N * r * p
+        self.maxmem = options.get(
+            "MAXMEM", 2 * 128 * self.work_factor * self.block_size * self.parallelism
+        )
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Argon2 with the cost from PASSWORD_HASHING["ARGON2"], requires argon2-cffi
+    """
+
+    def __init__(self):
+        options = get_hasher_options("ARGON2")
+        self.time_cost = options.get("TIME_COST", self.time_cost)
+        self.memory_cost = options.get("MEMORY_COST", self.memory_cost)
+        self.parallelism = options.get("PARALLELISM", self.parallelism)
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2 with the iterations from PASSWORD_HASHING["PBKDF2"]
+    """
+
+    def __init__(self):
+        options = get_hasher_options("PBKDF2")
+        self.iterations = options.get("ITERATIONS", self.iterations)
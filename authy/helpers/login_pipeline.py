@@ -0,0 +1,166 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.signals import user_logged_in
+from django.db import connections, transaction
+from django.db.models import OuterRef
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from structlog import get_logger
+
+from authy.helpers.token_helper import set_token_parameters
+from authy.models import Account
+from authy.signals import login_stage_completed
+from common.custom_exceptions.custom_exception import CustomException
+from common.response.response_information_codes.error_code import ErrorCode
+from subscription.caches.subscription_snapshot_cache import (
+    snapshot_from_json,
+    snapshot_to_json,
+    subscription_snapshot_cache,
+)
+from user.models import User
+
+log = get_logger(__name__)
+
+_last_login_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _update_last_login(account_id):
+    try:
+        Account.objects.filter(id=account_id).update(last_login=timezone.now())
+    except Exception as e:
+        log.error("Last login update failed", account_id=account_id, exception=str(e))
+    finally:
+        # Connections of the executor thread are not closed by request signals
+        connections.close_all()
+
+
+def defer_last_login_update(account_id):
+    global _last_login_executor
+    if _last_login_executor is None:
+        _last_login_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="last-login"
+        )
+    _last_login_executor.submit(_update_last_login, account_id)
+
+
+def deferred_update_last_login(sender, user, **kwargs):
+    """
+    user_logged_in receiver replacing django.contrib.auth's update_last_login
+    when LOGIN_PIPELINE["DEFER_LAST_LOGIN_UPDATE"] is on
+    """
+    account_id = user.id
+    transaction.on_commit(lambda: defer_last_login_update(account_id))
+
+
+class LoginPipeline:
+    """
+    Login in stages: one query for user, locale and subscription,
+    password check through authenticate(), token creation and user_logged_in,
+    whose last login update is deferred to a background thread unless disabled
+    through LOGIN_PIPELINE settings. Timing of each stage is sent through
+    login_stage_completed.
+    """
+
+    def __init__(
+        self, password: str, email: str = None, phone: str = None, request=None
+    ):
+        self.request = request
+        self.password = password
+        self.email = email
+        self.phone = phone
+
+    @contextmanager
+    def stage(self, name: str):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            login_stage_completed.send_robust(
+                sender=self.__class__,
+                stage=name,
+                duration=time.perf_counter() - started_at,
+            )
+
+    def load_user(self) -> User:
+        query_set = (
+            User.objects.filter(email=self.email)
+            if self.email
+            else User.objects.filter(phone=self.phone)
+        )
+        user = (
+            query_set.select_related("locale")
+            .annotate(
+                subscription_snapshot=subscription_snapshot_cache.subquery(
+                    OuterRef("id")
+                )
+            )
+            .first()
+        )
+        if user is None:
+            raise CustomException(
+                detail={"email": ["User with this email doesn't exist"]},
+                code=ErrorCode.NOT_FOUND_ERROR,
+                status_code=status.HTTP_404_NOT_FOUND,
+                message=(
+                    _("User with this email doesn't exist")
+                    if self.email
+                    else _("User with this phone doesn't exist")
+                ),
+            )
+        return user
+
+    def check_password(self, account_id) -> Account:
+        # Through the authentication backends, so user_login_failed is sent
+        account = authenticate(self.request, id=account_id, password=self.password)
+        if account is None:
+            raise CustomException(
+                detail={
+                    "email": ["Invalid email or password"],
+                    "password": ["Invalid email or password"],
+                },
+                code=ErrorCode.AUTHENTICATION_FAILED,
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message=_("Incorrect password"),
+            )
+        return account
+
+    def create_tokens(self, account: Account, user: User) -> Dict:
+        from authy.serializers import CustomTokenObtainPairSerializer
+
+        snapshot = snapshot_from_json(user.subscription_snapshot)
+        subscription_snapshot_cache.set(user.id, snapshot)
+
+        refresh_token = CustomTokenObtainPairSerializer.get_token(account, user)
+        access_token = set_token_parameters(
+            refresh_token.access_token,
+            {
+                "subscription": (
+                    snapshot_to_json(snapshot) if snapshot is not None else None
+                ),
+                "locale_code": user.locale.code,
+            },
+        )
+        return {"access": str(access_token), "refresh": str(refresh_token)}
+
+    def update_last_login(self, account: Account):
+        user_logged_in.send(
+            sender=account.__class__, request=self.request, user=account
+        )
+
+    def run(self) -> Dict:
+        with self.stage("load_user"):
+            user = self.load_user()
+        with self.stage("check_password"):
+            account = self.check_password(user.account_id)
+        with self.stage("create_tokens"):
+            tokens = self.create_tokens(account, user)
+        with self.stage("update_last_login"):
+            self.update_last_login(account)
+        with self.stage("serialize_user"):
+            user_dict = user.to_dict()
+        return {**tokens, "user": user_dict}
@@ -1,13 +1,18 @@
-from typing import Dict
+from typing import Dict, Optional
 
 from rest_framework_simplejwt.tokens import Token
 
-from user.models import User
+from subscription.caches.subscription_snapshot_cache import (
+    subscription_snapshot_cache,
+)
 
 
-def get_token_subscription_for_user(user: User):
-    subscription = user.last_or_active_subscription
-    return subscription
+def get_token_subscription_for_user(user_id) -> Optional[Dict]:
+    """
+    Subscription claim of the user, read from the snapshot cache without
+    loading the user or writing the subscription status
+    """
+    return subscription_snapshot_cache.get_json(user_id)
 
 
 def set_token_parameters(token: Token, parameters: Dict[str, any]) -> Token:
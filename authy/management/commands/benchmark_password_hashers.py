@@ -0,0 +1,104 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+PASSWORD = "benchmark-password"
+
+
+def hash_passwords(algorithm: str, overrides: dict, iterations: int) -> float:
+    """
+    Seconds spent on hashing the password iterations times in this process
+    """
+    hasher = next(hasher for hasher in get_hashers() if hasher.algorithm == algorithm)
+    for attribute, value in overrides.items():
+        setattr(hasher, attribute, value)
+    salt = hasher.salt()
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        hasher.encode(PASSWORD, salt)
+    return time.perf_counter() - started_at
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures hashes per second of the configured password hashers, for a "
+        "single worker and for all workers hashing at once"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations", type=int, default=20, help="Hashes per worker"
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=3,
+            help="Processes hashing at once, as many as the gunicorn workers",
+        )
+        parser.add_argument(
+            "--algorithm",
+            action="append",
+            help="Only benchmark these algorithms (e.g. scrypt, argon2, pbkdf2_sha256)",
+        )
+        parser.add_argument(
+            "--set",
+            action="append",
+            default=[],
+            metavar="ATTRIBUTE=VALUE",
+            help="Override a hasher cost, e.g. work_factor=32768 or iterations=300000",
+        )
+
+    def handle(self, *args, **options):
+        overrides = {}
+        for override in options["set"]:
+            attribute, value = override.split("=", 1)
+            overrides[attribute] = int(value)
+
+        iterations = options["iterations"]
+        workers = options["workers"]
+        for index, hasher in enumerate(get_hashers()):
+            if options["algorithm"] and hasher.algorithm not in options["algorithm"]:
+                continue
+            hasher_overrides = {
+                attribute: value
+                for attribute, value in overrides.items()
+                if hasattr(hasher, attribute)
+            }
+            try:
+                single = hash_passwords(hasher.algorithm, hasher_overrides, iterations)
+            except ValueError as e:
+                # Library of the hasher is not installed
+                self.stdout.write(f"{hasher.algorithm}: skipped, {e}")
+                continue
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                started_at = time.perf_counter()
+                list(
+                    executor.map(
+                        hash_passwords,
+                        [hasher.algorithm] * workers,
+                        [hasher_overrides] * workers,
+                        [iterations] * workers,
+                    )
+                )
+                concurrent = time.perf_counter() - started_at
+
+            parameters = ", ".join(
+                f"{key}={value}"
+                for key, value in hasher.safe_summary(
+                    hasher.encode(PASSWORD, hasher.salt())
+                ).items()
+                if key not in ("algorithm", "salt", "hash")
+            )
+            self.stdout.write(
+                f"{hasher.algorithm}{' (preferred)' if index == 0 else ''}: {parameters}"
+            )
+            self.stdout.write(
+                f"  per worker: {single / iterations * 1000:.1f} ms/hash, "
+                f"{iterations / single:.1f} hashes/s"
+            )
+            self.stdout.write(
+                f"  {workers} workers: {workers * iterations / concurrent:.1f} hashes/s"
+            )
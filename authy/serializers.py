@@ -1,8 +1,7 @@
-from typing import Dict, Union
+from typing import Dict
 
 from django.conf import settings
 from django.contrib.auth import authenticate
-from django.contrib.auth.models import update_last_login
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.translation import gettext_lazy as _
 from phonenumber_field.serializerfields import PhoneNumberField
@@ -10,14 +9,10 @@ from rest_framework import serializers, status
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import RefreshToken, Token
 
-from authy.helpers.token_helper import (
-    get_token_subscription_for_user,
-    set_token_parameters,
-)
+from authy.helpers.login_pipeline import LoginPipeline
+from authy.helpers.token_helper import get_token_subscription_for_user
 from common.custom_exceptions.custom_exception import CustomException
 from common.response.response_information_codes.error_code import ErrorCode
-from subscription.models import UserSubscription
-from user.models import User
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -36,6 +31,8 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token["user_id"] = str(user.id)
         token["role"] = user.role
         token["school_id"] = str(user.school_id) if user.school_id else None
+        token["email_verified"] = user.email_verified
+        token["phone_verified"] = user.phone_verified
 
         return token
 
@@ -85,60 +82,13 @@ class UserLoginSerializer(serializers.Serializer):
                 message=_("Enter email or phone not both"),
             )
 
-        password = data["password"]
-        user = (
-            User.objects.filter(email=email).select_related("locale").first()
-            if email
-            else User.objects.filter(phone=phone).select_related("locale").first()
-        )
-
-        if user is None:
-            raise CustomException(
-                detail={"email": ["User with this email doesn't exist"]},
-                code=ErrorCode.NOT_FOUND_ERROR,
-                status_code=status.HTTP_404_NOT_FOUND,
-                message=(
-                    _("User with this email doesn't exist")
-                    if email
-                    else _("User with this phone doesn't exist")
-                ),
-            )
-        account = authenticate(id=user.account_id, password=password)
-
-        if account is None:
-            raise CustomException(
-                detail={
-                    "email": ["Invalid email or password"],
-                    "password": ["Invalid email or password"],
-                },
-                code=ErrorCode.AUTHENTICATION_FAILED,
-                status_code=status.HTTP_400_BAD_REQUEST,
-                message=_("Incorrect password"),
-            )
-
         try:
-            token = CustomTokenObtainPairSerializer.get_token(account, user)
-            refresh_token = token
-            access_token = token.access_token
-            subscription = get_token_subscription_for_user(user)
-            access_token = set_token_parameters(
-                access_token,
-                {
-                    "subscription": (
-                        subscription.safe_json() if subscription is not None else None
-                    ),
-                    "locale_code": user.locale.code,
-                },
-            )
-
-            update_last_login(None, account)
-
-            validation = {
-                "access": str(access_token),
-                "refresh": str(refresh_token),
-                "user": user.to_dict(),
-            }
-            return validation
+            return LoginPipeline(
+                password=data["password"],
+                email=email,
+                phone=phone,
+                request=self.context.get("request", None),
+            ).run()
         except ObjectDoesNotExist:
             raise CustomException(
                 "Invalid login credentials",
@@ -251,12 +201,14 @@ class CustomTokenRefreshSerializer(serializers.Serializer):
     def validate(self, attrs):
         refresh = self.token_class(attrs["refresh"])
         access_token = refresh.access_token
-        subscription = self.get_user_subscription_from_token(access_token)
+        user_id = access_token.payload.get("user_id", None)
         access_token = self.set_token_parameters(
             access_token,
             {
                 "subscription": (
-                    subscription.safe_json() if subscription is not None else None
+                    get_token_subscription_for_user(user_id)
+                    if user_id is not None
+                    else None
                 ),
                 "locale_code": access_token.payload.get("locale_code"),
             },
@@ -287,15 +239,3 @@ class CustomTokenRefreshSerializer(serializers.Serializer):
             token.payload[key] = parameters[key]
 
         return token
-
-    def get_user_subscription_from_token(
-        self, token: Token
-    ) -> Union[UserSubscription, None]:
-        payload = token.payload
-        user_id = payload.get("user_id", None)
-        if user_id is not None:
-            user = User.objects.get(pk=user_id)
-            return get_token_subscription_for_user(user)
-
-        else:
-            return None
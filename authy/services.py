@@ -55,13 +55,10 @@ class RegistrationService:
         token = CustomTokenObtainPairSerializer.get_token(account, user)
         refresh_token = token
         access_token = token.access_token
-        subscription = get_token_subscription_for_user(user)
         access_token = set_token_parameters(
             access_token,
             {
-                "subscription": (
-                    subscription.safe_json() if subscription is not None else None
-                ),
+                "subscription": get_token_subscription_for_user(user.id),
                 "locale_code": user.locale.code,
             },
         )
@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+# Sent with stage (name of the stage) and duration (seconds) for each login stage
+login_stage_completed = Signal()
@@ -1,13 +1,25 @@
 import jwt
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.signals import user_logged_in, user_login_failed
+from django.test import override_settings
 from django.urls import reverse
 from mock import patch
 from model_bakery import baker
 
 from authy.models import Account
+from authy.signals import login_stage_completed
 from contact_verification.models import ContactVerification
 from custom_test.base_test import CustomIntegrationTestCase
 from user.models import User
 
+STATELESS_REST_FRAMEWORK = {
+    **settings.REST_FRAMEWORK,
+    "DEFAULT_AUTHENTICATION_CLASSES": (
+        "authy.authentication.StatelessJWTAuthentication",
+    ),
+}
+
 
 class AuthenticationTestCase(CustomIntegrationTestCase):
     def setUp(self):
@@ -124,6 +136,99 @@ class AuthenticationTestCase(CustomIntegrationTestCase):
         ).get("email")
         self.assertEqual(response_email, self.email_user.email)
 
+    def test_login_token_carries_verification_claims(self):
+        User.objects.filter(id=self.email_user.id).update(email_verified=True)
+        data = {"email": self.email_user.email, "password": self.email_password}
+
+        url = reverse("login")
+        response = self.client.post(url, data, format="json")
+        access_token = response.data["response_body"]["access"]
+
+        payload = jwt.decode(access_token, options={"verify_signature": False})
+        self.assertTrue(payload.get("email_verified"))
+        self.assertFalse(payload.get("phone_verified"))
+
+    def test_login_reports_stage_timings(self):
+        stages = []
+
+        def receiver(sender, stage, duration, **kwargs):
+            stages.append(stage)
+
+        login_stage_completed.connect(receiver)
+        try:
+            data = {"email": self.email_user.email, "password": self.email_password}
+            response = self.client.post(reverse("login"), data, format="json")
+        finally:
+            login_stage_completed.disconnect(receiver)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            stages,
+            [
+                "load_user",
+                "check_password",
+                "create_tokens",
+                "update_last_login",
+                "serialize_user",
+            ],
+        )
+
+    def test_login_sends_auth_signals(self):
+        logged_in, login_failed = [], []
+
+        def logged_in_receiver(sender, request, user, **kwargs):
+            logged_in.append(user.id)
+
+        def login_failed_receiver(sender, credentials, request, **kwargs):
+            login_failed.append(credentials)
+
+        user_logged_in.connect(logged_in_receiver)
+        user_login_failed.connect(login_failed_receiver)
+        try:
+            data = {"email": self.email_user.email, "password": "wrong-password"}
+            response = self.client.post(reverse("login"), data, format="json")
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(len(login_failed), 1)
+            self.assertEqual(logged_in, [])
+
+            data = {"email": self.email_user.email, "password": self.email_password}
+            response = self.client.post(reverse("login"), data, format="json")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(logged_in, [self.email_account.id])
+            self.assertEqual(len(login_failed), 1)
+        finally:
+            user_logged_in.disconnect(logged_in_receiver)
+            user_login_failed.disconnect(login_failed_receiver)
+
+    def test_login_rehashes_password_with_preferred_hasher(self):
+        self.email_account.password = make_password(
+            self.email_password, hasher="pbkdf2_sha256"
+        )
+        self.email_account.save()
+
+        data = {"email": self.email_user.email, "password": self.email_password}
+        response = self.client.post(reverse("login"), data, format="json")
+        self.assertEqual(response.status_code, 200)
+
+        self.email_account.refresh_from_db()
+        self.assertTrue(self.email_account.password.startswith("scrypt$"))
+        self.assertTrue(self.email_account.check_password(self.email_password))
+
+    @override_settings(REST_FRAMEWORK=STATELESS_REST_FRAMEWORK)
+    def test_deactivated_account_is_rejected_by_stateless_authentication(self):
+        data = {"email": self.email_user.email, "password": self.email_password}
+        response = self.client.post(reverse("login"), data, format="json")
+        access_token = response.data["response_body"]["access"]
+
+        url = reverse("user-detail-viewset", kwargs={"user_id": self.email_user.id})
+        response = self.client.get(url, HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        self.assertEqual(response.status_code, 200)
+
+        self.email_account.is_active = False
+        self.email_account.save()
+        response = self.client.get(url, HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        self.assertEqual(response.status_code, 401)
+
     def test_login_with_invalid_email(self):
         data = {"email": "invalidemail@email.com", "password": self.email_password}
 
@@ -32,7 +32,9 @@ class UserLoginView(APIView):
 
     @swagger_auto_schema(request_body=UserLoginSerializer)
     def post(self, request):
-        serializer = self.serializer_class(data=request.data)
+        serializer = self.serializer_class(
+            data=request.data, context={"request": request}
+        )
         valid = serializer.is_valid(raise_exception=True)
 
         if valid:
@@ -52,9 +54,7 @@ class UserLoginView(APIView):
                 struct_logger=log,
                 view_name=self.__class__.__name__,
                 method_name="post",
-                request_body=request.data,
-                request_path=request.get_full_path(),
-                request_method=request.method,
+                request=request,
                 view_response=view_response,
             )
 
@@ -86,9 +86,7 @@ class UserRegisterView(APIView):
                 struct_logger=log,
                 view_name=self.__class__.__name__,
                 method_name="post",
-                request_body=request.data,
-                request_path=request.get_full_path(),
-                request_method=request.method,
+                request=request,
                 view_response=view_response,
             )
 
@@ -108,9 +106,7 @@ class PasswordViewSet(GenericViewSet):
             struct_logger=log,
             view_name=self.__class__.__name__,
             method_name="reset_password",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
+            request=request,
             view_response=view_response,
         )
 
@@ -131,9 +127,7 @@ class UpdatePasswordViewSet(GenericViewSet):
             struct_logger=log,
             view_name=self.__class__.__name__,
             method_name="create",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
+            request=request,
             view_response=view_response,
         )
 
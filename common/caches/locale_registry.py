@@ -0,0 +1,91 @@
+import copy
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+
+class LocaleRegistry:
+    """
+    In-process index of locales by code and id, loaded once and refreshed on
+    Locale changes through signals. Lookups return copies of the indexed
+    instances, so callers may change them without affecting other requests.
+    """
+
+    def __init__(self):
+        config = getattr(settings, "LOCALE_REGISTRY", {})
+        self.timeout = config.get("TIMEOUT", 5 * 60)
+        self.reload_on_miss_interval = config.get("RELOAD_ON_MISS_INTERVAL", 5)
+        self._by_code = {}
+        self._by_id = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        from common.models import Locale  # Import here to avoid circular imports
+
+        locales = list(Locale.objects.all())
+        self._by_code = {locale.code: locale for locale in locales}
+        self._by_id = {locale.id: locale for locale in locales}
+        self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        loaded_at = self._loaded_at
+        if loaded_at is not None and time.monotonic() - loaded_at < self.timeout:
+            return
+        with self._lock:
+            if self._loaded_at is loaded_at:
+                self._load()
+
+    def _reload_on_miss(self) -> bool:
+        loaded_at = self._loaded_at
+        if (
+            loaded_at is not None
+            and time.monotonic() - loaded_at < self.reload_on_miss_interval
+        ):
+            return False
+        with self._lock:
+            if self._loaded_at is loaded_at:
+                self._load()
+        return True
+
+    def _get(self, index_name: str, key):
+        self._ensure_loaded()
+        locale = getattr(self, index_name).get(key, None)
+        if locale is None and self._reload_on_miss():
+            locale = getattr(self, index_name).get(key, None)
+        return locale
+
+    def get_by_code(self, code: str):
+        locale = self._get("_by_code", code)
+        return copy.copy(locale) if locale is not None else None
+
+    def get_by_id(self, id: int):
+        locale = self._get("_by_id", id)
+        return copy.copy(locale) if locale is not None else None
+
+    def get_id(self, code: str) -> Optional[int]:
+        locale = self._get("_by_code", code)
+        return locale.id if locale else None
+
+    def get_ids(self, codes: Iterable[str]) -> Dict[str, int]:
+        locale_ids = {}
+        for code in codes:
+            locale_id = self.get_id(code)
+            if locale_id is not None:
+                locale_ids[code] = locale_id
+        return locale_ids
+
+    def all(self) -> List:
+        self._ensure_loaded()
+        return [copy.copy(locale) for locale in self._by_id.values()]
+
+    def clear(self):
+        with self._lock:
+            self._by_code = {}
+            self._by_id = {}
+            self._loaded_at = None
+
+
+locale_registry = LocaleRegistry()
@@ -0,0 +1,171 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+ResolvedText = Tuple[Optional[int], str]
+
+
+class LocalLRUCache:
+    """
+    Thread safe, size bounded in-process cache with per entry expiry
+    """
+
+    def __init__(self, max_size: int, timeout: Optional[float]):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable) -> Dict:
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key, None)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at is not None and expires_at <= now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = value
+        return found
+
+    def set_many(self, values: Dict):
+        expires_at = time.monotonic() + self.timeout if self.timeout else None
+        with self._lock:
+            for key, value in values.items():
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete_many(self, keys: Iterable):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class TranslationCache:
+    """
+    Two tier cache of resolved translation texts keyed by (root_id, locale_code).
+    Entries of a root are kept together so that a root can be invalidated at once.
+    """
+
+    KEY_PREFIX = "translation"
+
+    def __init__(self):
+        config = getattr(settings, "TRANSLATION_CACHE", {})
+        self.shared_cache_alias = config.get("SHARED_CACHE_ALIAS", None)
+        self.shared_timeout = config.get("SHARED_TIMEOUT", 60 * 60)
+        self._texts = LocalLRUCache(
+            config.get("LOCAL_MAX_SIZE", 10000), config.get("LOCAL_TIMEOUT", 60)
+        )
+        self._root_ids = LocalLRUCache(
+            config.get("LOCAL_MAX_SIZE", 10000), config.get("LOCAL_TIMEOUT", 60)
+        )
+
+    @property
+    def shared_cache(self):
+        if not self.shared_cache_alias:
+            return None
+        return caches[self.shared_cache_alias]
+
+    def _shared_key(self, root_id: int) -> str:
+        return f"{self.KEY_PREFIX}:{root_id}"
+
+    def get_root_ids(self, translation_ids: Iterable[int]) -> Dict[int, int]:
+        return self._root_ids.get_many(translation_ids)
+
+    def set_root_ids(self, root_ids: Dict[int, int]):
+        self._root_ids.set_many(root_ids)
+
+    def get_texts(
+        self, root_ids: Iterable[int], locale_code: str
+    ) -> Dict[int, ResolvedText]:
+        root_ids = list(root_ids)
+        local_entries = self._texts.get_many(root_ids)
+        resolved = {
+            root_id: entry[locale_code]
+            for root_id, entry in local_entries.items()
+            if locale_code in entry
+        }
+
+        shared_cache = self.shared_cache
+        missing_root_ids = [root_id for root_id in root_ids if root_id not in resolved]
+        if shared_cache is None or not missing_root_ids:
+            return resolved
+
+        shared_entries = shared_cache.get_many(
+            [self._shared_key(root_id) for root_id in missing_root_ids]
+        )
+        backfill = {}
+        for root_id in missing_root_ids:
+            entry = shared_entries.get(self._shared_key(root_id), None)
+            if entry is None or locale_code not in entry:
+                continue
+            resolved[root_id] = entry[locale_code]
+            backfill[root_id] = {**local_entries.get(root_id, {}), **entry}
+        self._texts.set_many(backfill)
+        return resolved
+
+    def set_texts(self, texts: Dict[int, ResolvedText], locale_code: str):
+        if not texts:
+            return
+        local_entries = self._texts.get_many(texts.keys())
+        entries = {
+            root_id: {**local_entries.get(root_id, {}), locale_code: resolved_text}
+            for root_id, resolved_text in texts.items()
+        }
+        self._texts.set_many(entries)
+
+        shared_cache = self.shared_cache
+        if shared_cache is None:
+            return
+        shared_entries = shared_cache.get_many(
+            [self._shared_key(root_id) for root_id in texts.keys()]
+        )
+        shared_cache.set_many(
+            {
+                self._shared_key(root_id): {
+                    **shared_entries.get(self._shared_key(root_id), {}),
+                    locale_code: resolved_text,
+                }
+                for root_id, resolved_text in texts.items()
+            },
+            timeout=self.shared_timeout,
+        )
+
+    def invalidate(self, root_ids: Iterable[Optional[int]]):
+        root_ids = [root_id for root_id in set(root_ids) if root_id is not None]
+        if not root_ids:
+            return
+        self._texts.delete_many(root_ids)
+        shared_cache = self.shared_cache
+        if shared_cache is not None:
+            shared_cache.delete_many(
+                [self._shared_key(root_id) for root_id in root_ids]
+            )
+
+    def invalidate_translation(
+        self, translation_id: Optional[int], root_id: Optional[int]
+    ):
+        if translation_id is not None:
+            self._root_ids.delete_many([translation_id])
+        self.invalidate([root_id, translation_id])
+
+    def clear(self):
+        self._texts.clear()
+        self._root_ids.clear()
+
+
+translation_cache = TranslationCache()
@@ -1,3 +1,6 @@
+import functools
+from typing import Dict, Type
+
 from django.contrib.sessions.exceptions import SessionInterrupted
 from django.core.exceptions import (
     ObjectDoesNotExist,
@@ -32,6 +35,11 @@ from rest_framework.exceptions import (
 from rest_framework_simplejwt.exceptions import InvalidToken
 
 from common.response.response_information_codes.error_code import ErrorCode
+from utils.db import (
+    POSTGRES_MAX_IDENTIFIER_LENGTH,
+    get_integrity_error_constraint_name,
+    is_unique_violation,
+)
 
 
 class ExceptionHandlingParameters(object):
@@ -56,105 +64,136 @@ class APIExceptionHandlingParameters(object):
         self.response_message = response_message
 
 
-def get_integrity_error_parameters(error: Exception):
-    if "duplicate key" in str(error):
-        return ExceptionHandlingParameters(
-            "Already exists!",
-            status.HTTP_400_BAD_REQUEST,
-            ErrorCode.DUPLICATE_KEY_ERROR,
-            _("Already exist!"),
-        )
-    return ExceptionHandlingParameters(
-        "Integrity Error!",
-        status.HTTP_500_INTERNAL_SERVER_ERROR,
-        ErrorCode.INTEGRITY_ERROR,
-    )
+DUPLICATE_KEY_PARAMETERS = ExceptionHandlingParameters(
+    "Already exists!",
+    status.HTTP_400_BAD_REQUEST,
+    ErrorCode.DUPLICATE_KEY_ERROR,
+    _("Already exist!"),
+)
+
+INTEGRITY_ERROR_PARAMETERS = ExceptionHandlingParameters(
+    "Integrity Error!",
+    status.HTTP_500_INTERNAL_SERVER_ERROR,
+    ErrorCode.INTEGRITY_ERROR,
+)
+
+INTEGRITY_ERROR_CONSTRAINT_MAPPER = {
+    "unique_user_active_subscription": ExceptionHandlingParameters(
+        "User already has an active subscription!",
+        status.HTTP_400_BAD_REQUEST,
+        ErrorCode.ACTIVE_SUBSCRIPTION_EXISTS,
+        _("You already have an active subscription!"),
+    ),
+    "unique_payment_transaction_payment_vendor_key_transaction_id_if_not_deleted": ExceptionHandlingParameters(
+        "Transaction is already processed!",
+        status.HTTP_400_BAD_REQUEST,
+        ErrorCode.DUPLICATE_REQUEST,
+        _("Already exist!"),
+    ),
+}
+
+# Keyed by the names Postgres reports, which are truncated
+_INTEGRITY_ERROR_CONSTRAINT_LOOKUP = {
+    constraint_name[:POSTGRES_MAX_IDENTIFIER_LENGTH]: parameters
+    for constraint_name, parameters in INTEGRITY_ERROR_CONSTRAINT_MAPPER.items()
+}
+
+
+def get_integrity_error_parameters(
+    error: IntegrityError,
+) -> ExceptionHandlingParameters:
+    constraint_name = get_integrity_error_constraint_name(error)
+    if constraint_name in _INTEGRITY_ERROR_CONSTRAINT_LOOKUP:
+        return _INTEGRITY_ERROR_CONSTRAINT_LOOKUP[constraint_name]
+    if is_unique_violation(error):
+        return DUPLICATE_KEY_PARAMETERS
+    return INTEGRITY_ERROR_PARAMETERS
 
 
 EXCEPTION_HANDLER_MAPPER = {
-    Exception: lambda x: ExceptionHandlingParameters(
+    Exception: ExceptionHandlingParameters(
         "Unknown error!",
         status.HTTP_500_INTERNAL_SERVER_ERROR,
         ErrorCode.UNKNOWN_ERROR,
         _("An error occured!"),
     ),
     IntegrityError: get_integrity_error_parameters,
-    ObjectDoesNotExist: lambda x: ExceptionHandlingParameters(
+    ObjectDoesNotExist: ExceptionHandlingParameters(
         "Object doesn't exist!",
         status.HTTP_404_NOT_FOUND,
         ErrorCode.NOT_FOUND_ERROR,
         _("Content not found!"),
     ),
-    PermissionDenied: lambda x: ExceptionHandlingParameters(
+    PermissionDenied: ExceptionHandlingParameters(
         "This operations is not permitted!",
         status.HTTP_403_FORBIDDEN,
         ErrorCode.PERMISSION_DENIED,
         _("You don't have permission for this action!"),
     ),
-    ViewDoesNotExist: lambda x: ExceptionHandlingParameters(
+    ViewDoesNotExist: ExceptionHandlingParameters(
         "View doesn't exist!",
         status.HTTP_500_INTERNAL_SERVER_ERROR,
         ErrorCode.VIEW_DOESNT_EXIST,
         _("An error occured!"),
     ),
-    MiddlewareNotUsed: lambda x: ExceptionHandlingParameters(
+    MiddlewareNotUsed: ExceptionHandlingParameters(
         "Middleware not used!",
         status.HTTP_500_INTERNAL_SERVER_ERROR,
         ErrorCode.MIDDLEWARE_NOT_USED,
         _("An error occured!"),
     ),
-    ImproperlyConfigured: lambda x: ExceptionHandlingParameters(
+    ImproperlyConfigured: ExceptionHandlingParameters(
         "Improperly configured!",
         status.HTTP_500_INTERNAL_SERVER_ERROR,
         ErrorCode.IMPROPERLY_CONFIGURED,
         _("An error occured!"),
     ),
-    FieldError: lambda x: ExceptionHandlingParameters(
+    FieldError: ExceptionHandlingParameters(
         "Field Error!",
         status.HTTP_500_INTERNAL_SERVER_ERROR,
         ErrorCode.FIELD_ERROR,
         _("An error occured!"),
     ),
-    CoreValidationError: lambda x: ExceptionHandlingParameters(
+    CoreValidationError: ExceptionHandlingParameters(
         "Data is not valid!",
         status.HTTP_400_BAD_REQUEST,
         ErrorCode.INVALID_INPUT,
         _("Request parameters are not valid!"),
     ),
-    BadRequest: lambda x: ExceptionHandlingParameters(
+    BadRequest: ExceptionHandlingParameters(
         "Bad request!",
         status.HTTP_400_BAD_REQUEST,
         ErrorCode.BAD_REQUEST,
         _("Bad request!"),
     ),
-    RequestAborted: lambda x: ExceptionHandlingParameters(
+    RequestAborted: ExceptionHandlingParameters(
         "Request aborted!", 499, ErrorCode.REQUEST_ABORTED, _("Request aborted!")
     ),
-    SynchronousOnlyOperation: lambda x: ExceptionHandlingParameters(
+    SynchronousOnlyOperation: ExceptionHandlingParameters(
         "SynchronousOnlyOperation!",
         status.HTTP_500_INTERNAL_SERVER_ERROR,
         ErrorCode.INTERNAL_SERVER_ERROR,
         _("An error occured!"),
     ),
-    UnreadablePostError: lambda x: ExceptionHandlingParameters(
+    UnreadablePostError: ExceptionHandlingParameters(
         "Upload is aborted!",
         status.HTTP_400_BAD_REQUEST,
         ErrorCode.FILE_UNREADABLE,
         _("Upload is aborted!"),
     ),
-    SessionInterrupted: lambda x: ExceptionHandlingParameters(
+    SessionInterrupted: ExceptionHandlingParameters(
         "Session interrupted!",
         status.HTTP_400_BAD_REQUEST,
         ErrorCode.SESSION_INTERRUPTED,
         _("Session interrupted!"),
     ),
-    TransactionManagementError: lambda x: ExceptionHandlingParameters(
+    TransactionManagementError: ExceptionHandlingParameters(
         "Something bad occurred on transaction management!",
         status.HTTP_500_INTERNAL_SERVER_ERROR,
         ErrorCode.TRANSACTION_MANAGEMENT_ERROR,
         _("An error occured!"),
     ),
-    Http404: lambda x: ExceptionHandlingParameters(
+    Http404: ExceptionHandlingParameters(
         "No content!",
         status.HTTP_404_NOT_FOUND,
         ErrorCode.NOT_FOUND_ERROR,
@@ -200,3 +239,37 @@ API_EXCEPTION_HANDLER_MAPPER = {
         ErrorCode.INVALID_TOKEN, _("Not authenticated!")
     ),
 }
+
+
+def _resolve(mapper: Dict, exception_class: Type[Exception]):
+    for klass in exception_class.__mro__:
+        if klass in mapper:
+            return mapper[klass]
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_exception_handler(exception_class: Type[Exception]):
+    return _resolve(EXCEPTION_HANDLER_MAPPER, exception_class)
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_api_exception_handler(exception_class: Type[Exception]):
+    return _resolve(API_EXCEPTION_HANDLER_MAPPER, exception_class)
+
+
+def resolve_exception_handling_parameters(
+    exc: Exception,
+) -> ExceptionHandlingParameters:
+    """
+    Parameters of the closest mapped class in the MRO of the exception, the
+    returned object is shared and must not be modified
+    """
+    handler = _resolve_exception_handler(exc.__class__)
+    return handler(exc) if callable(handler) else handler
+
+
+def resolve_api_exception_handling_parameters(
+    exc: APIException,
+) -> APIExceptionHandlingParameters:
+    return _resolve_api_exception_handler(exc.__class__)
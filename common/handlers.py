@@ -0,0 +1,24 @@
+from django.db import connections, transaction
+from django.db.models.signals import post_save, post_delete, pre_migrate
+from django.dispatch import receiver
+
+from common.caches.locale_registry import locale_registry
+from common.models import Locale
+
+
+@receiver(post_save, sender=Locale)
+@receiver(post_delete, sender=Locale)
+def handle_locale_change(sender, instance, **kwargs):
+    # Reload lazily, again after commit since other requests may reload before it
+    locale_registry.clear()
+    transaction.on_commit(locale_registry.clear)
+
+
+@receiver(pre_migrate)
+def create_postgres_extensions(sender, app_config, using, **kwargs):
+    # Indexes of common models need these before their migrations run
+    connection = connections[using]
+    if app_config.label != "common" or connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
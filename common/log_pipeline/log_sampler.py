@@ -0,0 +1,65 @@
+import json
+import random
+from typing import Dict, Optional
+
+from django.conf import settings
+
+
+class LogSamplingPolicy:
+    __slots__ = ("sample_rate", "max_payload_size")
+
+    def __init__(self, sample_rate: float, max_payload_size: Optional[int]):
+        self.sample_rate = sample_rate
+        self.max_payload_size = max_payload_size
+
+
+class LogSampler:
+    """
+    Per view sampling of successful request logs and payload size budgets,
+    configured under LOG_SAMPLING with "<view_name>.<method_name>" keys.
+    Failures are always logged.
+    """
+
+    def __init__(self):
+        config = getattr(settings, "LOG_SAMPLING", {})
+        self.default_policy = LogSamplingPolicy(
+            config.get("DEFAULT_SAMPLE_RATE", 1.0),
+            config.get("MAX_PAYLOAD_SIZE", None),
+        )
+        self.view_configs = config.get("VIEWS", {})
+        self._policies: Dict[str, LogSamplingPolicy] = {}
+
+    def get_policy(self, view_name: str, method_name: str) -> LogSamplingPolicy:
+        key = f"{view_name}.{method_name}"
+        policy = self._policies.get(key, None)
+        if policy is None:
+            view_config = self.view_configs.get(key, {})
+            policy = LogSamplingPolicy(
+                view_config.get("SAMPLE_RATE", self.default_policy.sample_rate),
+                view_config.get(
+                    "MAX_PAYLOAD_SIZE", self.default_policy.max_payload_size
+                ),
+            )
+            self._policies[key] = policy
+        return policy
+
+    @staticmethod
+    def is_sampled(policy: LogSamplingPolicy, is_successful: bool) -> bool:
+        if not is_successful or policy.sample_rate >= 1:
+            return True
+        return policy.sample_rate > 0 and random.random() < policy.sample_rate
+
+    @staticmethod
+    def limit_payload(payload, max_payload_size: Optional[int]):
+        """
+        Serialize the payload and cut it to the budget when it does not fit
+        """
+        if payload is None or max_payload_size is None:
+            return payload
+        serialized = json.dumps(payload, default=str, ensure_ascii=False)
+        if len(serialized) <= max_payload_size:
+            return payload
+        return f"{serialized[:max_payload_size]}...(truncated {len(serialized)} chars)"
+
+
+log_sampler = LogSampler()
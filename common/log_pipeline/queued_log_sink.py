@@ -0,0 +1,195 @@
+import atexit
+import os
+import queue
+import random
+import threading
+import time
+import traceback
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+
+
+class QueuedLogRecord:
+    """
+    A log call captured on the request path and written later by the sink.
+    The traceback of exc_info is formatted right away, so queued records don't
+    keep frames and their locals alive.
+    """
+
+    __slots__ = ("struct_logger", "level", "event", "fields")
+
+    def __init__(
+        self,
+        struct_logger,
+        level: str,
+        event: str,
+        fields: Dict,
+        exc_info: Optional[Tuple] = None,
+    ):
+        if exc_info is not None:
+            fields = {
+                **fields,
+                "exception_stack_trace": "".join(traceback.format_exception(*exc_info)),
+            }
+        self.struct_logger = struct_logger
+        self.level = level
+        self.event = event
+        self.fields = fields
+
+    @property
+    def is_error(self) -> bool:
+        return self.level in ("error", "exception", "critical")
+
+    def write(self):
+        getattr(self.struct_logger, self.level)(self.event, **self.fields)
+
+
+class QueuedLogSink:
+    """
+    Bounded in-memory queue of log records drained by a background writer thread.
+    Successful request records are sampled once the queue fills past the high
+    watermark, and any record is dropped when the queue is full. Records left in
+    the queue are written at exit.
+    """
+
+    def __init__(
+        self,
+        is_async: bool = True,
+        max_queue_size: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        high_watermark: float = 0.8,
+        pressure_sample_rate: float = 0.1,
+    ):
+        self.is_async = is_async
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.high_watermark_size = int(max_queue_size * high_watermark)
+        self.pressure_sample_rate = pressure_sample_rate
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._writer = None
+        self._writer_pid = None
+        self._writer_lock = threading.Lock()
+        self._is_drained_at_exit = False
+        self._write_lock = threading.Lock()
+        self._counters = {
+            "enqueued": 0,
+            "written": 0,
+            "failed": 0,
+            "dropped": 0,
+            "sampled_out": 0,
+        }
+        self._counters_lock = threading.Lock()
+        self._reported_losses = 0
+
+    @classmethod
+    def from_settings(cls) -> "QueuedLogSink":
+        config = getattr(settings, "LOG_PIPELINE", {})
+        return cls(
+            is_async=config.get("ASYNC", True),
+            max_queue_size=config.get("MAX_QUEUE_SIZE", 10000),
+            batch_size=config.get("BATCH_SIZE", 200),
+            flush_interval=config.get("FLUSH_INTERVAL", 0.5),
+            high_watermark=config.get("HIGH_WATERMARK", 0.8),
+            pressure_sample_rate=config.get("PRESSURE_SAMPLE_RATE", 0.1),
+        )
+
+    def _increment(self, counter: str, amount: int = 1):
+        with self._counters_lock:
+            self._counters[counter] += amount
+
+    def stats(self) -> Dict[str, int]:
+        with self._counters_lock:
+            return {**self._counters, "queued": self._queue.qsize()}
+
+    def emit(self, record: QueuedLogRecord):
+        if not self.is_async:
+            self._write_batch([record])
+            return
+
+        self._ensure_writer()
+        if (
+            not record.is_error
+            and self._queue.qsize() >= self.high_watermark_size
+            and random.random() >= self.pressure_sample_rate
+        ):
+            self._increment("sampled_out")
+            return
+        try:
+            self._queue.put_nowait(record)
+            self._increment("enqueued")
+        except queue.Full:
+            self._increment("dropped")
+
+    def _ensure_writer(self):
+        # Writer threads do not survive a fork, so gunicorn workers start their own
+        if self._writer_pid == os.getpid() and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer_pid == os.getpid() and self._writer.is_alive():
+                return
+            self._writer = threading.Thread(
+                target=self._run, name="queued-log-sink", daemon=True
+            )
+            self._writer_pid = os.getpid()
+            self._writer.start()
+            if not self._is_drained_at_exit:
+                # The writer is a daemon thread, queued records are flushed at exit
+                atexit.register(self.flush)
+                self._is_drained_at_exit = True
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        with self._write_lock:
+            written = 0
+            for record in batch:
+                try:
+                    record.write()
+                    written += 1
+                except Exception:
+                    self._increment("failed")
+            self._increment("written", written)
+            self._report_losses(batch[-1].struct_logger)
+
+    def _report_losses(self, struct_logger):
+        stats = self.stats()
+        losses = stats["dropped"] + stats["sampled_out"]
+        if losses == self._reported_losses:
+            return
+        self._reported_losses = losses
+        struct_logger.warning(
+            "Log records were dropped under pressure.",
+            dropped=stats["dropped"],
+            sampled_out=stats["sampled_out"],
+            queued=stats["queued"],
+        )
+
+    def flush(self):
+        """
+        Write all queued records on the calling thread
+        """
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write_batch(batch)
+
+
+log_sink = QueuedLogSink.from_settings()
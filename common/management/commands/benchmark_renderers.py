@@ -0,0 +1,139 @@
+import datetime
+import timeit
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from common.renderers import ORJSONRenderer
+from common.response.response_information_codes.message_code import MessageCode
+from common.response.view_response import ViewResponse
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares rendering times of JSONRenderer and ORJSONRenderer on list payloads"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size", type=int, default=500, help="Number of items in each list"
+        )
+        parser.add_argument(
+            "--iterations", type=int, default=50, help="Renders per measurement"
+        )
+        parser.add_argument(
+            "--from-db",
+            action="store_true",
+            help="Serialize list payloads from the database instead of synthetic ones",
+        )
+
+    @staticmethod
+    def synthetic_payloads(size: int):
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        buyables = [
+            {
+                "id": index,
+                "name": f"Buyable {index}",
+                "title_id": index * 2,
+                "description_id": index * 2 + 1,
+                "title": "Premium subscription",
+                "description": "Unlimited access to all content",
+                "price": Decimal("649.99"),
+                "currency": "TRY",
+                "period": "MONTHLY",
+                "type": "PERSONAL_SUBSCRIPTION",
+                "trial_days": 7,
+                "special_offer_root": None,
+                "created": now,
+                "updated": now,
+            }
+            for index in range(size)
+        ]
+        users = [
+            {
+                "id": uuid.uuid4(),
+                "fullname": f"User {index}",
+                "email": f"user{index}@example.com",
+                "email_verified": True,
+                "phone": "+905321234567",
+                "phone_verified": False,
+                "role": "STUDENT",
+                "school": index % 10,
+                "created": now,
+                "updated": now,
+            }
+            for index in range(size)
+        ]
+        translations = [
+            {
+                "id": index,
+                "root": index - index % 3,
+                "locale": index % 3 + 1,
+                "text": f"Translated text number {index}",
+                "created": now,
+                "updated": now,
+            }
+            for index in range(size)
+        ]
+        return {"buyables": buyables, "users": users, "translations": translations}
+
+    @staticmethod
+    def database_payloads(size: int):
+        from common.models import Translation
+        from common.serializers import TranslationSerializer
+        from payment.models import Buyable
+        from payment.serializers import BuyableSerializer
+        from user.models import User
+        from user.serializers import UserSerializer
+
+        return {
+            "buyables": BuyableSerializer(
+                Buyable.objects.all()
+                .select_related("title")
+                .select_related("description")[:size],
+                many=True,
+            ).data,
+            "users": UserSerializer(
+                User.objects.all().select_related("school")[:size], many=True
+            ).data,
+            "translations": TranslationSerializer(
+                Translation.objects.all()
+                .select_related("root")
+                .select_related("locale")[:size],
+                many=True,
+            ).data,
+        }
+
+    def handle(self, *args, **options):
+        payloads = (
+            self.database_payloads(options["size"])
+            if options["from_db"]
+            else self.synthetic_payloads(options["size"])
+        )
+        renderers = [JSONRenderer(), ORJSONRenderer()]
+        iterations = options["iterations"]
+
+        for name, payload in payloads.items():
+            envelope = ViewResponse(
+                response_body=payload,
+                response_status=200,
+                is_successful=True,
+                response_information_code=MessageCode.LIST_CONTENT_SUCCESS,
+            ).envelope
+            self.stdout.write(f"{name} ({len(payload)} items)")
+            timings = {}
+            for renderer in renderers:
+                renderer_name = renderer.__class__.__name__
+                timings[renderer_name] = (
+                    timeit.timeit(lambda: renderer.render(envelope), number=iterations)
+                    / iterations
+                )
+                self.stdout.write(
+                    f"  {renderer_name}: {timings[renderer_name] * 1000:.3f} ms, "
+                    f"{len(renderer.render(envelope))} bytes"
+                )
+            self.stdout.write(
+                f"  speedup: {timings['JSONRenderer'] / timings['ORJSONRenderer']:.1f}x"
+            )
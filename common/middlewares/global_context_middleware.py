@@ -1,12 +1,13 @@
-import threading
+from contextvars import ContextVar, Token
 from typing import TYPE_CHECKING
-from typing import Union
+from typing import Optional, Union
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.utils.functional import cached_property
 from pytz.tzinfo import DstTzInfo, StaticTzInfo
 from rest_framework.request import Request
-from rest_framework.response import Response
 
+from common.permissions.principal import Principal, get_principal
 from common.types import LocaleCode
 from user.types import UserRole
 from utils.date import timezone_with_fallback
@@ -19,29 +20,21 @@ class GlobalContext:
     def __init__(self, request: Request):
         self.request = request
 
+    @property
+    def principal(self) -> Principal:
+        return get_principal(self.request)
+
     @cached_property
-    def user_id(self) -> int:
-        return (
-            self.request.auth.payload.get("user_id")
-            if self.request.auth and self.request.auth.payload
-            else None
-        )
+    def user_id(self) -> Optional[str]:
+        return str(self.principal.user_id) if self.principal.user_id else None
 
     @cached_property
     def user_role(self) -> UserRole:
-        return (
-            UserRole(self.request.auth.payload.get("role", UserRole.NONE.value))
-            if self.request.auth and self.request.auth.payload
-            else UserRole.NONE
-        )
+        return self.principal.role
 
     @cached_property
     def user_school_id(self) -> str:
-        return (
-            self.request.auth.payload.get("school_id", None)
-            if self.request.auth and self.request.auth.payload
-            else None
-        )
+        return self.principal.school_id
 
     @cached_property
     def user_timezone(self) -> Union[StaticTzInfo, DstTzInfo]:
@@ -53,6 +46,10 @@ class GlobalContext:
         account = self.request.user
         if str(account.__class__.__name__) == "Account":
             return account.user
+        if self.principal.user_id is not None:
+            from user.models import User  # Import here to avoid circular imports
+
+            return User.objects.filter(id=self.principal.user_id).first()
         return None
 
     @cached_property
@@ -83,51 +80,73 @@ class GlobalContextMiddleware:
     Provides storage for the "current" request object, so that code anywhere
     in your project can access it, without it having to be passed to that code
     from the view.
+    Context is kept in a context variable, so it follows the request across
+    threads and coroutines under both WSGI and ASGI.
     """
 
-    _contexts = {}
+    sync_capable = True
+    async_capable = True
+
+    _context: ContextVar[Optional[GlobalContext]] = ContextVar(
+        "global_context", default=None
+    )
 
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request: Request):
-        self.process_request(request)
-        response = self.get_response(request)
-        self.process_response(request, response)
-        return response
-
-    def process_request(self, request: Request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = self.process_request(request)
+        try:
+            return self.get_response(request)
+        finally:
+            self.process_response(token)
+
+    async def __acall__(self, request: Request):
+        token = self.process_request(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            self.process_response(token)
+
+    def process_request(self, request: Request) -> Token:
         """
         Store the current request.
         """
         global_context = GlobalContext(request)
-        self.__class__.set_global_context(global_context)
+        return self.__class__.set_global_context(global_context)
 
-    def process_response(self, request: Request, response: Response):
+    def process_response(self, token: Token) -> None:
         """
-        Delete the current request to avoid leaking memory.
+        Restore the previous context even if the response raised.
         """
-        self.__class__.del_global_context()
-        return response
+        self.__class__.del_global_context(token)
 
     @classmethod
     def get_global_context(cls, default=None) -> GlobalContext:
         """
-        Retrieve the request object for the current thread, or the optionally
+        Retrieve the request object for the current context, or the optionally
         provided default if there is no current request.
         """
-        return cls._contexts.get(threading.current_thread(), default)
+        context = cls._context.get()
+        return context if context is not None else default
 
     @classmethod
-    def set_global_context(cls, context: GlobalContext) -> None:
+    def set_global_context(cls, context: GlobalContext) -> Token:
         """
-        Save the given request into storage for the current thread.
+        Save the given request into storage for the current context.
         """
-        cls._contexts[threading.current_thread()] = context
+        return cls._context.set(context)
 
     @classmethod
-    def del_global_context(cls) -> None:
+    def del_global_context(cls, token: Token = None) -> None:
         """
-        Delete the request that was stored for the current thread.
+        Delete the request that was stored for the current context.
         """
-        cls._contexts.pop(threading.current_thread(), None)
+        if token is not None:
+            cls._context.reset(token)
+        else:
+            cls._context.set(None)
@@ -0,0 +1,34 @@
+from typing import List
+
+from django.db import connections, router
+from django_softdelete.models import SoftDeleteManager
+
+
+def allocate_ids(model, count: int, using: str = None) -> List[int]:
+    """Reserve ids from the primary key sequence of the model"""
+
+    if count <= 0:
+        return []
+    using = using or router.db_for_write(model)
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+            [model._meta.db_table, model._meta.pk.column, count],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def assign_root_ids(model, objs, using: str = None):
+    """Give new roots an id up front so that root_id = id is written at insert"""
+
+    roots = [obj for obj in objs if obj.pk is None and obj.root_id is None]
+    for obj, id in zip(roots, allocate_ids(model, len(roots), using)):
+        obj.pk = id
+        obj.root_id = id
+
+
+class SelfRootedSoftDeleteManager(SoftDeleteManager):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        assign_root_ids(self.model, objs, self.db)
+        return super().bulk_create(objs, *args, **kwargs)
@@ -1,10 +1,12 @@
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import pycountry
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
-from django.db.models import Q, Subquery, F, Prefetch
+from django.db.models import Q, Subquery, F, Prefetch, Case, When, Value
+from django.db.models.functions import Upper
 from django_softdelete.models import SoftDeleteModel
 
 from cloud_storage.constants.file_upload_constants import (
@@ -16,6 +18,12 @@ from cloud_storage.get_cloud_storage_client import (
     get_cloud_storage_vendor,
 )
 from cloud_storage.idrive_client import CloudRequest
+from common.caches.locale_registry import locale_registry
+from common.caches.translation_cache import translation_cache
+from common.model_managers.self_rooted_managers import (
+    SelfRootedSoftDeleteManager,
+    assign_root_ids,
+)
 from common.types import FileType, LocaleCode
 from utils.converters import ModelConverter
 from utils.fields import DateTimeWithoutTZField
@@ -90,6 +98,9 @@ class Locale(models.Model):
 
     @classmethod
     def get_default(cls) -> "Locale":
+        locale = locale_registry.get_by_code("tr-TR")
+        if locale is not None:
+            return locale
         locale, created = cls.objects.get_or_create(
             name="Turkish (Türkiye)",
             code="tr-TR",
@@ -100,8 +111,15 @@ class Locale(models.Model):
         )
         return locale
 
+    @classmethod
+    def get_default_id(cls) -> int:
+        return cls.get_default().id
+
     @classmethod
     def get_default_english(cls) -> "Locale":
+        locale = locale_registry.get_by_code("en-US")
+        if locale is not None:
+            return locale
         locale, created = cls.objects.get_or_create(
             name="English (USA)",
             code="en-US",
@@ -137,8 +155,29 @@ class Translation(SoftDeleteModel):
     updated = DateTimeWithoutTZField(auto_now=True, editable=False)
     deleted_at = DateTimeWithoutTZField(blank=True, null=True)
 
+    objects = SelfRootedSoftDeleteManager()
+
     class Meta:
         db_table = "translation"
+        indexes = [
+            # Require pg_trgm, see common.handlers.create_postgres_extensions.
+            # Serves text__trigram_similar, which compares the raw column
+            GinIndex(
+                fields=["text"],
+                opclasses=["gin_trgm_ops"],
+                name="translation_text_trgm_idx",
+            ),
+            # Serves text__icontains, which compiles to UPPER(text) LIKE UPPER(%s)
+            GinIndex(
+                OpClass(Upper("text"), name="gin_trgm_ops"),
+                name="translation_text_upper_trgm_idx",
+            ),
+            models.Index(
+                fields=["id"],
+                condition=Q(root_id=F("id")),
+                name="translation_root_idx",
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["root", "locale"],
@@ -160,25 +199,83 @@ class Translation(SoftDeleteModel):
             self.translations.exclude(id=self.id).delete()
 
         super(Translation, self).delete(using=using, keep_parents=keep_parents)
+        self.invalidate_cache()
 
     @transaction.atomic
     def save(
             self, force_insert=False, force_update=False, using=None, update_fields=None
     ):
-        is_create = not bool(self.id)
+        if self.id is None and self.root_id is None:
+            assign_root_ids(Translation, [self], using)
+            force_insert = True
         super().save(force_insert, force_update, using, update_fields)
-        if is_create and self.root_id is None:
-            self.root_id = self.id
-            self.save()
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        translation_id, root_id = self.id, self.root_id
+        translation_cache.invalidate_translation(translation_id, root_id)
+        # Readers may have cached the old text before this transaction committed
+        transaction.on_commit(
+            lambda: translation_cache.invalidate_translation(translation_id, root_id)
+        )
 
     def get_text_by_locale_code_or_default(self, locale_code: str) -> str:
-        original_translation = self.root
-        translation = (
-                original_translation.translations.filter(locale__code=locale_code).first()
-                or original_translation.translations.filter(locale__code="en").first()
-                or original_translation.translations.first()
+        resolved_texts = Translation.resolve_texts(
+            [self.id], Translation.get_locale_fallback_chain(locale_code)
+        )
+        root_id, localized_id, text = resolved_texts.get(self.id, (None, None, ""))
+        return text
+
+    @staticmethod
+    def get_locale_fallback_chain(locale_code: str) -> List[str]:
+        """
+        Returns locale codes to try in order before falling back to the root text
+        """
+        if not locale_code or locale_code == LocaleCode.EN.value:
+            return [LocaleCode.EN.value]
+        return [locale_code, LocaleCode.EN.value]
+
+    @staticmethod
+    def resolve_texts(
+            translation_ids: Iterable[int], locale_codes: Sequence[str]
+    ) -> Dict[int, Tuple[int, Optional[int], str]]:
+        """
+        Returns (root id, localized translation id, text) of each given translation in
+        one query. Locale codes are tried in order and the root text is used last, in
+        which case localized translation id is None.
+        """
+        translation_ids = [
+            translation_id
+            for translation_id in set(translation_ids)
+            if translation_id is not None
+        ]
+        if not translation_ids:
+            return {}
+
+        root_priority = len(locale_codes)
+        locale_ids = locale_registry.get_ids(locale_codes)
+        candidates = (
+            Translation.objects.filter(root__translations__id__in=translation_ids)
+            .filter(Q(locale_id__in=locale_ids.values()) | Q(id=F("root_id")))
+            .annotate(
+                priority=Case(
+                    *[
+                        When(locale_id=locale_ids[code], then=Value(index))
+                        for index, code in enumerate(locale_codes)
+                        if code in locale_ids
+                    ],
+                    default=Value(root_priority),
+                    output_field=models.IntegerField(),
+                )
+            )
+            .order_by("root__translations__id", "priority")
+            .distinct("root__translations__id")
+            .values_list("root__translations__id", "root_id", "id", "text", "priority")
         )
-        return translation.text if translation else ""
+        return {
+            requested_id: (root_id, id if priority < root_priority else None, text)
+            for requested_id, root_id, id, text, priority in candidates
+        }
 
     @staticmethod
     def get_list_of_texts_from_id_list(
@@ -187,41 +284,56 @@ class Translation(SoftDeleteModel):
         """
         Returns translated texts of given inputs
         """
-        translation_text_match = {}
-
-        def update_translation_match(root_id: int, id: int, text: str):
-            translation_text_match.update({root_id: text, id: text})
+        locale_codes = Translation.get_locale_fallback_chain(locale_code)
+        cache_locale_key = ">".join(locale_codes)
+        translation_ids = [
+            translation_id
+            for translation_id in translation_ids
+            if translation_id is not None
+        ]
 
-        root_ids = (
-            Translation.objects.filter(id__in=translation_ids)
-            .values_list("root_id", flat=True)
-            .all()
-        )
-        translations = Translation.objects.filter(
-            root_id__in=Subquery(root_ids), locale__code=locale_code
+        root_ids = translation_cache.get_root_ids(translation_ids)
+        resolved_texts = translation_cache.get_texts(
+            set(root_ids.values()), cache_locale_key
         )
-        for translation in translations:
-            update_translation_match(
-                translation.root_id, translation.id, translation.text
-            )
         missing_translation_ids = [
             translation_id
             for translation_id in translation_ids
-            if translation_text_match.get(translation_id, None) is None
+            if root_ids.get(translation_id, None) not in resolved_texts
         ]
-        missing_translations = Translation.objects.filter(
-            id__in=missing_translation_ids
-        ).select_related("root")
-        for missing_translation in missing_translations:
-            translation_text_match.update(
-                {missing_translation.id: missing_translation.root.text}
+        if missing_translation_ids:
+            loaded_texts = Translation.resolve_texts(
+                missing_translation_ids, locale_codes
             )
+            loaded_root_ids = {
+                translation_id: resolved_text[0]
+                for translation_id, resolved_text in loaded_texts.items()
+            }
+            loaded_resolved_texts = {
+                root_id: (localized_id, text)
+                for root_id, localized_id, text in loaded_texts.values()
+            }
+            translation_cache.set_root_ids(loaded_root_ids)
+            translation_cache.set_texts(loaded_resolved_texts, cache_locale_key)
+            root_ids.update(loaded_root_ids)
+            resolved_texts.update(loaded_resolved_texts)
+
+        translation_text_match = {}
+        for translation_id, root_id in root_ids.items():
+            if root_id not in resolved_texts:
+                continue
+            localized_id, text = resolved_texts[root_id]
+            if localized_id is not None:
+                translation_text_match.update({root_id: text, localized_id: text})
+            translation_text_match[translation_id] = text
         return translation_text_match
 
     @staticmethod
     def create_prefetch_for_language(language_code, field_route, **kwargs) -> Prefetch:
-        translations = Translation.objects.filter(locale__code=language_code)
-        return Prefetch(field_route, queryset=translations)
+        translations = Translation.objects.filter(
+            locale_id=locale_registry.get_id(language_code)
+        )
+        return Prefetch(field_route, queryset=translations, **kwargs)
 
 
 class TranslatedFile(SoftDeleteModel):
@@ -270,8 +382,17 @@ class TranslatedFile(SoftDeleteModel):
     updated = DateTimeWithoutTZField(auto_now=True, editable=False)
     deleted_at = DateTimeWithoutTZField(blank=True, null=True)
 
+    objects = SelfRootedSoftDeleteManager()
+
     class Meta:
         db_table = "translated_file"
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=Q(root_id=F("id")),
+                name="translated_file_root_idx",
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["root", "locale"],
@@ -298,11 +419,10 @@ class TranslatedFile(SoftDeleteModel):
     def save(
             self, force_insert=False, force_update=False, using=None, update_fields=None
     ):
-        is_create = not bool(self.id)
+        if self.id is None and self.root_id is None:
+            assign_root_ids(TranslatedFile, [self], using)
+            force_insert = True
         super().save(force_insert, force_update, using, update_fields)
-        if is_create and self.root_id is None:
-            self.root_id = self.id
-            self.save()
 
     @property
     def url(self):
@@ -357,7 +477,8 @@ class TranslatedFile(SoftDeleteModel):
             .all()
         )
         translations = TranslatedFile.objects.filter(
-            root_id__in=Subquery(root_ids), locale__code=locale_code
+            root_id__in=Subquery(root_ids),
+            locale_id=locale_registry.get_id(locale_code),
         )
         for translation in translations:
             update_translation_match(
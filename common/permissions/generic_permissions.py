@@ -1,22 +1,61 @@
-from django.contrib.auth.models import AnonymousUser
 from rest_framework import permissions
 
+from common.permissions.principal import Principal, get_principal
 from user.types import UserRole
 
 
+def is_role_or_owner(request, role: UserRole) -> bool:
+    """
+    Allows the given role and upper, or users working on their own components
+    """
+    principal = get_principal(request)
+    if not principal.is_authenticated:
+        return False
+    if principal.has_role(role):
+        return True
+    # Tokens of accounts without a user can't own anything
+    if principal.user_id is None:
+        return False
+
+    user_id_to_filter = (
+        request.parser_context.get("kwargs", {}).get("user_id")
+        or request.query_params.get("user_id")
+        or request.data.get("user_id")
+    )
+    writing_own_component = user_id_to_filter is None and request.method in [
+        "POST",
+        "PUT",
+        "PATCH",
+        "OPTIONS",
+        "DELETE",
+    ]
+    return principal.is_user(user_id_to_filter) or writing_own_component
+
+
+def is_verified(principal: Principal) -> bool:
+    if principal.user_id is None:
+        return False
+    if principal.is_verified is not None:
+        return principal.is_verified
+
+    # Tokens issued before the verification claims were added
+    from user.models import User  # Import here to avoid circular imports
+
+    verification = (
+        User.objects.filter(id=principal.user_id)
+        .values_list("email_verified", "phone_verified")
+        .first()
+    )
+    return bool(verification and any(verification))
+
+
 class EditorAndUp(permissions.BasePermission):
     """
     Global permission check for editor and upper roles
     """
 
     def has_permission(self, request, view):
-        auth = request.auth
-        if auth:
-            jwt_payload = auth.payload
-            role = UserRole(jwt_payload.get("role", None) or UserRole.NONE.value)
-            if role and role >= UserRole.EDITOR:
-                return True
-        return False
+        return get_principal(request).has_role(UserRole.EDITOR)
 
 
 class EditorAndUpOrReadOnly(permissions.BasePermission):
@@ -30,16 +69,12 @@ class EditorAndUpOrReadOnly(permissions.BasePermission):
         if request.method in ["GET"]:
             return True
 
-        auth = request.auth
-        if auth:
-            jwt_payload = auth.payload
-            role = UserRole(jwt_payload.get("role", None) or UserRole.NONE.value)
-            if role and (
-                role >= UserRole.EDITOR or view.action in ["list_with_progress"]
-            ):
-                return True
-
-        return False
+        principal = get_principal(request)
+        if not principal.is_authenticated:
+            return False
+        return principal.has_role(UserRole.EDITOR) or view.action in [
+            "list_with_progress"
+        ]
 
 
 class IsAdmin(permissions.BasePermission):
@@ -49,13 +84,7 @@ class IsAdmin(permissions.BasePermission):
     """
 
     def has_permission(self, request, view):
-        auth = request.auth
-        if auth:
-            jwt_payload = auth.payload
-            role = UserRole(jwt_payload.get("role", None) or UserRole.NONE.value)
-            if role and role >= UserRole.ADMIN:
-                return True
-        return False
+        return get_principal(request).has_role(UserRole.ADMIN)
 
 
 class AdminOrOwner(permissions.BasePermission):
@@ -65,40 +94,7 @@ class AdminOrOwner(permissions.BasePermission):
     """
 
     def has_permission(self, request, view):
-        auth = request.auth
-        if auth:
-            jwt_payload = auth.payload
-            role = UserRole(jwt_payload.get("role", None) or UserRole.NONE.value)
-            if role and role >= UserRole.ADMIN:
-                return True
-
-            account = request.user
-            user = None
-            if not account:
-                return False
-
-            try:
-                user = account.user
-            except:
-                return False
-
-            if not user:
-                return False
-            user_id_to_filter = (
-                request.parser_context.get("kwargs", {}).get("user_id")
-                or request.query_params.get("user_id")
-                or request.data.get("user_id")
-            )
-            writing_own_component = user_id_to_filter is None and request.method in [
-                "POST",
-                "PUT",
-                "PATCH",
-                "OPTIONS",
-                "DELETE",
-            ]
-            if str(user_id_to_filter) == str(user.id) or writing_own_component:
-                return True
-        return False
+        return is_role_or_owner(request, UserRole.ADMIN)
 
 
 class AdminOrOwnerOrReadonly(permissions.BasePermission):
@@ -111,40 +107,7 @@ class AdminOrOwnerOrReadonly(permissions.BasePermission):
         if view.action in ["list", "retrieve"]:
             return True
 
-        auth = request.auth
-        if auth:
-            jwt_payload = auth.payload
-            role = UserRole(jwt_payload.get("role", None) or UserRole.NONE.value)
-            if role and role >= UserRole.ADMIN:
-                return True
-
-            account = request.user
-            user = None
-            if not account:
-                return False
-
-            try:
-                user = account.user
-            except:
-                return False
-
-            if not user:
-                return False
-            user_id_to_filter = (
-                request.parser_context.get("kwargs", {}).get("user_id")
-                or request.query_params.get("user_id")
-                or request.data.get("user_id")
-            )
-            writing_own_component = user_id_to_filter is None and request.method in [
-                "POST",
-                "PUT",
-                "PATCH",
-                "OPTIONS",
-                "DELETE",
-            ]
-            if str(user_id_to_filter) == str(user.id) or writing_own_component:
-                return True
-        return False
+        return is_role_or_owner(request, UserRole.ADMIN)
 
 
 class EditorAndUpOrOwnerOrReadonly(permissions.BasePermission):
@@ -157,40 +120,7 @@ class EditorAndUpOrOwnerOrReadonly(permissions.BasePermission):
         if view.action in ["list", "retrieve"]:
             return True
 
-        auth = request.auth
-        if auth:
-            jwt_payload = auth.payload
-            role = UserRole(jwt_payload.get("role", None) or UserRole.NONE.value)
-            if role and role >= UserRole.EDITOR:
-                return True
-
-            account = request.user
-            user = None
-            if not account:
-                return False
-
-            try:
-                user = account.user
-            except:
-                return False
-
-            if not user:
-                return False
-            user_id_to_filter = (
-                request.parser_context.get("kwargs", {}).get("user_id")
-                or request.query_params.get("user_id")
-                or request.data.get("user_id")
-            )
-            writing_own_component = user_id_to_filter is None and request.method in [
-                "POST",
-                "PUT",
-                "PATCH",
-                "OPTIONS",
-                "DELETE",
-            ]
-            if str(user_id_to_filter) == str(user.id) or writing_own_component:
-                return True
-        return False
+        return is_role_or_owner(request, UserRole.EDITOR)
 
 
 class ContentPermission(permissions.BasePermission):
@@ -207,38 +137,26 @@ class ContentPermission(permissions.BasePermission):
         if view.action in ["list", "retrieve"]:
             return True
 
-        auth = request.auth
-        if auth:
-            jwt_payload = auth.payload
-            role = UserRole(jwt_payload.get("role", None) or UserRole.NONE.value)
-            if role and (
-                role >= UserRole.EDITOR or view.action in ["list_with_progress"]
-            ):
-                return True
-
-        return False
+        principal = get_principal(request)
+        if not principal.is_authenticated:
+            return False
+        return principal.has_role(UserRole.EDITOR) or view.action in [
+            "list_with_progress"
+        ]
 
     def has_object_permission(self, request, view, obj):
         """
         AllowAny if the object to retrieve is free or list operation is applied
         Allow subscribers if the object to retrieve is not free
         """
-        if request.auth:
-            jwt_payload = request.auth.payload
-            role = UserRole(jwt_payload.get("role", None) or UserRole.NONE.value)
-            if role and role >= UserRole.EDITOR:
-                return True
+        principal = get_principal(request)
+        if principal.has_role(UserRole.EDITOR):
+            return True
 
         if (
             view.action == "retrieve"
             and not (hasattr(obj, "free") and obj.free)
-            and (
-                request.user is None
-                or type(request.user) is AnonymousUser
-                or not (
-                    request.user.user.email_verified or request.user.user.phone_verified
-                )
-            )
+            and not is_verified(principal)
         ):
             return False
         return True
@@ -0,0 +1,104 @@
+import uuid
+from typing import Dict, Optional
+
+from user.types import UserRole
+
+
+class Principal:
+    """
+    Caller of a request as described by the claims of its access token
+    """
+
+    __slots__ = (
+        "is_authenticated",
+        "role",
+        "user_id",
+        "school_id",
+        "email",
+        "phone",
+        "email_verified",
+        "phone_verified",
+        "locale_code",
+    )
+
+    def __init__(
+        self,
+        is_authenticated: bool = False,
+        role: UserRole = UserRole.NONE,
+        user_id: Optional[uuid.UUID] = None,
+        school_id: Optional[str] = None,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        email_verified: Optional[bool] = None,
+        phone_verified: Optional[bool] = None,
+        locale_code: Optional[str] = None,
+    ):
+        self.is_authenticated = is_authenticated
+        self.role = role
+        self.user_id = user_id
+        self.school_id = school_id
+        self.email = email
+        self.phone = phone
+        self.email_verified = email_verified
+        self.phone_verified = phone_verified
+        self.locale_code = locale_code
+
+    @classmethod
+    def from_payload(cls, payload: Dict) -> "Principal":
+        try:
+            role = UserRole(payload.get("role", None) or UserRole.NONE.value)
+        except ValueError:
+            role = UserRole.NONE
+        try:
+            user_id = uuid.UUID(str(payload.get("user_id")))
+        except ValueError:
+            user_id = None
+        return cls(
+            is_authenticated=True,
+            role=role,
+            user_id=user_id,
+            school_id=payload.get("school_id", None),
+            email=payload.get("email", None),
+            phone=payload.get("phone", None),
+            email_verified=payload.get("email_verified", None),
+            phone_verified=payload.get("phone_verified", None),
+            locale_code=payload.get("locale_code", None),
+        )
+
+    def has_role(self, role: UserRole) -> bool:
+        return self.role >= role
+
+    def is_user(self, user_id) -> bool:
+        return self.user_id is not None and str(user_id) == str(self.user_id)
+
+    @property
+    def is_verified(self) -> Optional[bool]:
+        """
+        Whether email or phone of the user is verified, None for tokens issued
+        before the verification claims were added
+        """
+        if self.email_verified is None and self.phone_verified is None:
+            return None
+        return bool(self.email_verified or self.phone_verified)
+
+
+ANONYMOUS_PRINCIPAL = Principal()
+
+
+def get_principal(request) -> Principal:
+    """
+    Principal of the request, built once per authenticated token. Works with
+    both rest_framework and django requests.
+    """
+    if request is None:
+        return ANONYMOUS_PRINCIPAL
+    http_request = getattr(request, "_request", request)
+    auth = getattr(request, "auth", None)
+    cached = getattr(http_request, "_principal", None)
+    if cached is not None and cached[0] is auth:
+        return cached[1]
+
+    payload = getattr(auth, "payload", None)
+    principal = Principal.from_payload(payload) if payload else ANONYMOUS_PRINCIPAL
+    http_request._principal = (auth, principal)
+    return principal
@@ -0,0 +1,32 @@
+import orjson
+from phonenumber_field.phonenumber import PhoneNumber
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer on top of orjson. Dates and times are written in the same ISO
+    format as rest_framework's JSONEncoder, which converts the types orjson does
+    not know, so the output matches JSONRenderer.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+    json_encoder = JSONEncoder()
+
+    @classmethod
+    def default(cls, obj):
+        if isinstance(obj, PhoneNumber):
+            return str(obj)
+        return cls.json_encoder.default(obj)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        options = self.options
+        if self.get_indent(accepted_media_type, renderer_context):
+            # orjson only supports two space indentation
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=self.default, option=options)
@@ -0,0 +1,77 @@
+from typing import Dict, Tuple
+
+from django.http import Http404
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.response import Response
+from structlog import get_logger
+
+from common.response.response_information_codes.message_code import MessageCode
+from common.response.view_response import ViewResponse, log_view_response
+
+log = get_logger(__name__)
+
+
+class EnvelopeResponseMixin:
+    """
+    Wraps the data of successful responses into the ViewResponse envelope once,
+    right before rendering, and logs them unless listed in unlogged_actions.
+    Actions return plain DRF responses, message codes and messages are looked
+    up by action name.
+    """
+
+    unlogged_actions: Tuple[str, ...] = ()
+
+    envelope_message_codes: Dict[str, MessageCode] = {
+        "list": MessageCode.LIST_CONTENT_SUCCESS,
+        "retrieve": MessageCode.RETRIEVE_CONTENT_SUCCESS,
+        "create": MessageCode.CREATE_CONTENT_SUCCESS,
+        "bulk_create": MessageCode.CREATE_CONTENT_SUCCESS,
+        "update": MessageCode.UPDATE_CONTENT_SUCCESS,
+        "partial_update": MessageCode.UPDATE_CONTENT_SUCCESS,
+        "destroy": MessageCode.GENERAL_SUCCESS,
+    }
+    envelope_messages: Dict[str, str] = {
+        "create": _("Created successfully!"),
+        "bulk_create": _("Created successfully!"),
+        "update": _("Updated successfully!"),
+        "partial_update": _("Updated successfully!"),
+        "destroy": _("Deleted successfully!"),
+    }
+
+    def destroy(self, request, *args, **kwargs):
+        try:
+            super().destroy(request, *args, **kwargs)
+        except Http404:
+            pass
+        return Response({}, status=status.HTTP_204_NO_CONTENT)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Metadata of OPTIONS keeps the shape of DRF's metadata class
+        if (
+            isinstance(response, Response)
+            and request.method != "OPTIONS"
+            and not getattr(response, "exception", False)
+            and not getattr(response, "is_enveloped", False)
+        ):
+            action = getattr(self, "action", None) or request.method.lower()
+            view_response = ViewResponse(
+                response_body=response.data,
+                response_status=response.status_code,
+                is_successful=True,
+                response_information_code=self.envelope_message_codes.get(
+                    action, MessageCode.GENERAL_SUCCESS
+                ),
+                response_message=self.envelope_messages.get(action, None),
+            )
+            response.data = view_response.envelope
+            response.is_enveloped = True
+            if action not in self.unlogged_actions:
+                log_view_response(
+                    struct_logger=log,
+                    view_name=self.__class__.__name__,
+                    method_name=action,
+                    request=request,
+                    view_response=view_response,
+                )
+        return super().finalize_response(request, response, *args, **kwargs)
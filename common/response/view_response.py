@@ -1,4 +1,3 @@
-import traceback
 from enum import Enum
 from typing import Dict, Union, List
 
@@ -8,6 +7,8 @@ from rest_framework import status
 from rest_framework.response import Response
 
 import settings
+from common.log_pipeline.log_sampler import log_sampler
+from common.log_pipeline.queued_log_sink import QueuedLogRecord, log_sink
 from common.middlewares.global_context_middleware import GlobalContextMiddleware
 from common.response.response_information_codes.error_code import ErrorCode
 from common.response.response_information_codes.message_code import MessageCode
@@ -31,16 +32,21 @@ class ViewResponse:
         self._exception = exception
         self._response_message = response_message
 
-    @cached_property
-    def rest_response(self) -> Response:
-        data_content = {
+    @property
+    def envelope(self) -> Dict:
+        return {
             "success": self._is_successful,
             "status_code": self._response_status_code,
             "response_code": self._response_information_code.value,
             "response_body": self._response_body,
             "message": self._response_message,
         }
-        return Response(data=data_content, status=self._response_status_code)
+
+    @cached_property
+    def rest_response(self) -> Response:
+        response = Response(data=self.envelope, status=self._response_status_code)
+        response.is_enveloped = True
+        return response
 
     @property
     def error_message(self) -> Union[None, str]:
@@ -85,18 +91,6 @@ class ViewSuccessResponse(ViewResponse):
         )
 
 
-class ViewResponseNoContent(ViewResponse):
-    def __init__(self, response_message: str = None):
-        super().__init__(
-            {},
-            status.HTTP_204_NO_CONTENT,
-            True,
-            exception=None,
-            response_information_code=MessageCode.GENERAL_SUCCESS,
-            response_message=response_message,
-        )
-
-
 class ViewFailResponse(ViewResponse):
     def __init__(
         self,
@@ -160,38 +154,62 @@ def log_view_response(
     struct_logger,
     view_name: str,
     method_name: str,
-    request_body: Union[None, Dict, str],
-    request_path,
-    request_method,
     view_response: ViewResponse,
+    request=None,
+    request_body: Union[None, Dict, str] = None,
+    request_path=None,
+    request_method=None,
     **metrics,
 ):
-    exception_stack_trace = (
-        traceback.format_exc() if view_response.exception is not None else None
-    )
-    log_function = (
-        struct_logger.info if view_response.is_successful else struct_logger.error
+    """
+    Request fields are read from the request only when the record survives
+    sampling, and the request body only when it is going to be logged.
+    """
+    policy = log_sampler.get_policy(view_name, method_name)
+    if not log_sampler.is_sampled(policy, view_response.is_successful):
+        return
+
+    exception = view_response.exception
+    exc_info = (
+        (exception.__class__, exception, exception.__traceback__)
+        if exception is not None
+        else None
     )
+    log_level = "info" if view_response.is_successful else "error"
 
-    request_user_id = GlobalContextMiddleware.get_global_context().user_id
-    request_user_role = GlobalContextMiddleware.get_global_context().user_role
-    log_function(
-        f"{view_name}.{method_name}"
-        f'{" has succeeded." if view_response.is_successful else ""}'
-        f'{" failed with " + view_response.exception_name if view_response.exception_name else ""}',
-        user_id=request_user_id,
-        view_name=view_name,
-        method=method_name,
-        exception_name=view_response.exception_name,
-        exception_detail=view_response.exception_stack_trace,
-        exception_stack_trace=exception_stack_trace,
-        request_body=(
-            None
-            if view_response.is_successful and request_user_role < UserRole.STAFF
-            else request_body
-        ),
-        request_path=request_path,
-        request_method=request_method,
-        is_successful=view_response.is_successful,
-        **metrics,
+    global_context = GlobalContextMiddleware.get_global_context()
+    is_body_logged = (
+        not view_response.is_successful or global_context.user_role >= UserRole.STAFF
+    )
+    if request is not None:
+        request_body = request.data if is_body_logged else None
+        request_path = request.get_full_path()
+        request_method = request.method
+
+    log_sink.emit(
+        QueuedLogRecord(
+            struct_logger,
+            log_level,
+            f"{view_name}.{method_name}"
+            f'{" has succeeded." if view_response.is_successful else ""}'
+            f'{" failed with " + view_response.exception_name if view_response.exception_name else ""}',
+            dict(
+                user_id=global_context.user_id,
+                view_name=view_name,
+                method=method_name,
+                exception_name=view_response.exception_name,
+                exception_detail=view_response.exception_stack_trace,
+                exception_stack_trace=None,
+                request_body=(
+                    log_sampler.limit_payload(request_body, policy.max_payload_size)
+                    if is_body_logged
+                    else None
+                ),
+                request_path=request_path,
+                request_method=request_method,
+                is_successful=view_response.is_successful,
+                **metrics,
+            ),
+            exc_info=exc_info,
+        )
     )
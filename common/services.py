@@ -4,10 +4,12 @@ from django.db import transaction, IntegrityError
 from django.utils.translation import gettext_lazy as _
 from rest_framework import status
 
+from common.caches.translation_cache import translation_cache
 from common.custom_exceptions.custom_exception import CustomException
 from common.models import Translation, TranslatedFile
 from common.response.response_information_codes.error_code import ErrorCode
 from utils.converters import ModelConverter, ValueConverter
+from utils.db import violates_constraint
 
 
 class TranslationService:
@@ -29,9 +31,12 @@ class TranslationService:
             )
 
         try:
-            root_translation = Translation.objects.create(**root)
+            with transaction.atomic():
+                root_translation = Translation.objects.create(**root)
         except IntegrityError as e:
-            if "unique_locale_id_text_if_not_deleted" in str(e) and return_existing_one:
+            if return_existing_one and violates_constraint(
+                e, "unique_locale_id_text_if_not_deleted"
+            ):
                 root_translation = Translation.objects.filter(
                     locale_id=root.get("locale_id"), text=root.get("text")
                 ).first()
@@ -50,35 +55,53 @@ class TranslationService:
                 Translation(**translation, root_id=root_translation.id)
             )
 
-        created_translations = []
         if not return_existing_one:
             created_translations = Translation.objects.bulk_create(translation_list)
         else:
-            for translation_data in translations:
-                try:
-                    created_translations.append(
-                        Translation.objects.create(
-                            **translation_data, root_id=root_translation.id
-                        )
-                    )
-                except IntegrityError as e:
-                    if "unique_locale_id_text_if_not_deleted" in str(
-                        e
-                    ) or "unique_root_id_locale_id_if_not_deleted" in str(e):
-                        translation = Translation.objects.filter(
-                            locale=translation_data["locale_id"],
-                            text=translation_data["text"],
-                            root_id=root_translation,
-                        ).first()
-                        if not translation:
-                            raise e
-                        created_translations.append(translation)
-                    else:
-                        raise e
+            created_translations = TranslationService.bulk_upsert(
+                root_translation, translation_list
+            )
         created_translations = created_translations + [root_translation]
+        translation_cache.invalidate([root_translation.id])
+        transaction.on_commit(
+            lambda: translation_cache.invalidate([root_translation.id])
+        )
+        return ModelConverter.models_to_dicts(created_translations)
+
+    @staticmethod
+    def bulk_upsert(
+        root_translation: Translation, translation_list: List[Translation]
+    ) -> List[Translation]:
+        """
+        Inserts translations of the root skipping existing ones and returns them all.
+        Conflicts are ignored instead of updated since ON CONFLICT cannot target the
+        partial unique constraints of translation.
+        """
+        Translation.objects.bulk_create(translation_list, ignore_conflicts=True)
+        existing_translations = {
+            (translation.locale_id, translation.text): translation
+            for translation in Translation.objects.filter(
+                root_id=root_translation.id,
+                locale_id__in={
+                    translation.locale_id for translation in translation_list
+                },
+            )
+        }
+        conflicting_translations = [
+            {"locale_id": translation.locale_id, "text": translation.text}
+            for translation in translation_list
+            if (translation.locale_id, translation.text) not in existing_translations
+        ]
+        if conflicting_translations:
+            raise CustomException(
+                detail={"translations": conflicting_translations},
+                code=ErrorCode.DUPLICATE_KEY_ERROR,
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message=_("Already exist!"),
+            )
         return [
-            ModelConverter.model_to_dict(translation)
-            for translation in created_translations
+            existing_translations[(translation.locale_id, translation.text)]
+            for translation in translation_list
         ]
 
 
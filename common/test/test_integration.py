@@ -1,11 +1,56 @@
+import asyncio
+import datetime
+import json
+import uuid
+from decimal import Decimal
+from io import BytesIO
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from django.db import IntegrityError, connection, transaction
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from mock.mock import patch
+from django.utils.translation import gettext_lazy as _
+from mock.mock import Mock, PropertyMock, patch
 from model_bakery import baker
-from rest_framework import status
-
+from phonenumber_field.phonenumber import PhoneNumber
+from rest_framework import serializers, status
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from common.caches.locale_registry import LocaleRegistry, locale_registry
+from common.custom_exceptions.custom_exception import CustomException
+from common.exception_handling.exception_handler_mapper import (
+    resolve_exception_handling_parameters,
+)
+from common.log_pipeline.log_sampler import LogSampler
+from common.log_pipeline.queued_log_sink import QueuedLogRecord, QueuedLogSink
+from common.middlewares.global_context_middleware import (
+    GlobalContext,
+    GlobalContextMiddleware,
+)
 from common.models import Translation, TranslatedFile, Locale
+from common.parsers import ORJSONParser
+from common.permissions.generic_permissions import is_role_or_owner
+from common.response.response_information_codes.error_code import ErrorCode
+from common.renderers import ORJSONRenderer
+from common.response.view_response import (
+    ViewSuccessResponse,
+    ViewValidationFailureResponse,
+    log_view_response,
+)
+from common.services import TranslationService
 from common.types import FileType
 from custom_test.base_test import CustomIntegrationTestCase
+from payment.models import Purchase
+from user.types import UserRole
+from utils.converters import ModelConverter
+from utils.db import violates_constraint
+from utils.http_clients import HTTPClientRegistry
 
 
 class LocaleViewTestCase(CustomIntegrationTestCase):
@@ -35,6 +80,34 @@ class LocaleViewTestCase(CustomIntegrationTestCase):
             len(response.data.get("response_body").get("results")), 1
         )
 
+    @patch("common.response.envelope_response_mixin.log_view_response")
+    def test_only_locale_writes_are_logged(self, m_log_view_response):
+        url = reverse("locale-viewset")
+        response = self.client.get(
+            url, HTTP_AUTHORIZATION=f"Bearer {self.access_token}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        m_log_view_response.assert_not_called()
+
+        response = self.client.post(
+            url,
+            {"name": "New locale", "code": "en"},
+            format="json",
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        m_log_view_response.assert_called_once()
+        self.assertEqual(m_log_view_response.call_args.kwargs["method_name"], "create")
+
+    def test_options_metadata_is_not_enveloped(self):
+        url = reverse("locale-viewset")
+        response = self.client.options(
+            url, HTTP_AUTHORIZATION=f"Bearer {self.access_token}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("name", response.data)
+        self.assertNotIn("response_body", response.data)
+
     def test_create_locale(self):
         data = {"name": "New locale", "code": "en"}
         locale_count = Locale.objects.count()
@@ -80,6 +153,16 @@ class LocaleViewTestCase(CustomIntegrationTestCase):
         )
         self.assertFalse(Locale.objects.filter(id=created_locale.id).exists())
 
+    def test_delete_missing_locale_is_enveloped(self):
+        url = reverse("locale-detail-viewset", kwargs={"id": 0})
+        response = self.client.delete(
+            url, format="json", HTTP_AUTHORIZATION=f"Bearer {self.access_token}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertTrue(response.data.get("success"))
+        self.assertEqual(response.data.get("response_code"), "MSG_GENERAL_SUCCESS")
+        self.assertEqual(response.data.get("response_body"), {})
+
 
 class TranslationTestCase(CustomIntegrationTestCase):
 
@@ -102,6 +185,65 @@ class TranslationTestCase(CustomIntegrationTestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertGreaterEqual(len(response.data.get("response_body")), 2)
 
+    def test_list_root_translations(self):
+        baker.make(
+            Translation,
+            text="Hello World",
+            root=self.root_translation,
+            locale=self.eng_locale,
+        )
+        url = reverse("translation-viewset")
+        response = self.client.get(
+            url, {"is_root": "true"}, HTTP_AUTHORIZATION=f"Bearer {self.access_token}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for translation in response.data.get("response_body"):
+            self.assertEqual(translation.get("root"), translation.get("id"))
+
+    def test_search_translations_containing_text(self):
+        baker.make(
+            Translation,
+            text="Hello World",
+            root=self.root_translation,
+            locale=self.eng_locale,
+        )
+        url = reverse("translation-viewset")
+        response = self.client.get(
+            url,
+            {"text": "world", "search_mode": "contains"},
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            "Hello World",
+            [translation["text"] for translation in response.data["response_body"]],
+        )
+
+    def test_search_translations_by_similarity(self):
+        baker.make(
+            Translation,
+            text="Hello World",
+            root=self.root_translation,
+            locale=self.eng_locale,
+        )
+        url = reverse("translation-viewset")
+        response = self.client.get(
+            url,
+            {"text": "Hello Wrld", "search_mode": "trigram"},
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["response_body"][0]["text"], "Hello World")
+
+    def test_search_translations_with_invalid_mode(self):
+        url = reverse("translation-viewset")
+        response = self.client.get(
+            url,
+            {"text": "world", "search_mode": "regex"},
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_create_translation(self):
         data = {
             "text": "Hello World",
@@ -162,6 +304,136 @@ class TranslationTestCase(CustomIntegrationTestCase):
         )
         self.assertFalse(Translation.objects.filter(id=translation.id).exists())
 
+    def test_get_list_of_texts_from_id_list_is_cached(self):
+        english_translation = baker.make(
+            Translation,
+            text="Hello World",
+            root=self.root_translation,
+            locale=self.eng_locale,
+        )
+        texts = Translation.get_list_of_texts_from_id_list(
+            [self.root_translation.id], "en"
+        )
+        self.assertEqual(texts[self.root_translation.id], "Hello World")
+
+        with self.assertNumQueries(0):
+            Translation.get_list_of_texts_from_id_list([self.root_translation.id], "en")
+
+        english_translation.text = "Hello!"
+        english_translation.save()
+        texts = Translation.get_list_of_texts_from_id_list(
+            [self.root_translation.id], "en"
+        )
+        self.assertEqual(texts[self.root_translation.id], "Hello!")
+
+    def test_bulk_create_roots(self):
+        roots = Translation.objects.bulk_create(
+            [
+                Translation(text=f"Root {index}", locale=self.eng_locale)
+                for index in range(3)
+            ]
+        )
+        for root in roots:
+            self.assertIsNotNone(root.id)
+            self.assertEqual(Translation.objects.get(id=root.id).root_id, root.id)
+
+    def test_bulk_upsert_returns_existing_and_new_translations_once(self):
+        german_locale = baker.make(Locale, name="German", code="de-DE")
+        english_translation = baker.make(
+            Translation,
+            text="Hello World",
+            root=self.root_translation,
+            locale=self.eng_locale,
+        )
+
+        translations = TranslationService.bulk_create(
+            {
+                "root": {
+                    "text": self.root_translation.text,
+                    "locale_id": self.locale.id,
+                },
+                "translations": [
+                    {"text": "Hello World", "locale_id": self.eng_locale.id},
+                    {"text": "Hallo Welt", "locale_id": german_locale.id},
+                ],
+            },
+            {"return_existing_one": "true"},
+        )
+
+        ids = [translation["id"] for translation in translations]
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(len(set(ids)), 3)
+        self.assertIn(english_translation.id, ids)
+        self.assertIn(self.root_translation.id, ids)
+        self.assertEqual(
+            Translation.objects.filter(root_id=self.root_translation.id).count(), 3
+        )
+
+    def test_bulk_upsert_rejects_translation_of_another_root(self):
+        baker.make(
+            Translation,
+            text="Hello World",
+            root=self.root_translation,
+            locale=self.eng_locale,
+        )
+
+        with self.assertRaises(CustomException) as context:
+            TranslationService.bulk_create(
+                {
+                    "root": {"text": "Selam Dünya", "locale_id": self.locale.id},
+                    "translations": [
+                        {"text": "Hello World", "locale_id": self.eng_locale.id}
+                    ],
+                },
+                {"return_existing_one": "true"},
+            )
+        self.assertEqual(context.exception.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_upsert_queries_do_not_grow_with_translations(self):
+        locales = [
+            baker.make(Locale, name=f"Locale {code}", code=code)
+            for code in ("de-DE", "fr-FR", "es-ES", "it-IT")
+        ]
+
+        def upsert(root_text: str, count: int):
+            with CaptureQueriesContext(connection) as queries:
+                TranslationService.bulk_create(
+                    {
+                        "root": {"text": root_text, "locale_id": self.locale.id},
+                        "translations": [
+                            {"text": f"{root_text} {index}", "locale_id": locale.id}
+                            for index, locale in enumerate(locales[:count])
+                        ],
+                    },
+                    {"return_existing_one": "true"},
+                )
+            return len(queries)
+
+        self.assertEqual(upsert("Bir", 1), upsert("Dört", 4))
+
+    def test_resolve_texts_follows_locale_fallback_chain(self):
+        english_translation = baker.make(
+            Translation,
+            text="Hello World",
+            root=self.root_translation,
+            locale=self.eng_locale,
+        )
+        with self.assertNumQueries(1):
+            resolved_texts = Translation.resolve_texts(
+                [self.root_translation.id, english_translation.id], ["de", "en"]
+            )
+        self.assertEqual(
+            resolved_texts[self.root_translation.id],
+            (self.root_translation.id, english_translation.id, "Hello World"),
+        )
+        self.assertEqual(resolved_texts[english_translation.id][2], "Hello World")
+
+        resolved_texts = Translation.resolve_texts([self.root_translation.id], ["de"])
+        self.assertEqual(
+            resolved_texts[self.root_translation.id],
+            (self.root_translation.id, None, "Merhaba Dünya"),
+        )
+
 
 class TranslatedFileTestCase(CustomIntegrationTestCase):
 
@@ -272,3 +544,476 @@ class TranslatedFileTestCase(CustomIntegrationTestCase):
             url, format="json", HTTP_AUTHORIZATION=f"Bearer {self.access_token}"
         )
         self.assertFalse(TranslatedFile.objects.filter(id=translated_file.id).exists())
+
+
+class ExceptionHandlerMapperTestCase(CustomIntegrationTestCase):
+    def test_subclass_resolves_to_closest_mapped_class(self):
+        class MissingLocale(Http404):
+            pass
+
+        parameters = resolve_exception_handling_parameters(MissingLocale())
+        self.assertEqual(parameters.response_status, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            parameters.response_information_code, ErrorCode.NOT_FOUND_ERROR
+        )
+
+    def test_duplicate_translation_is_mapped_by_constraint(self):
+        locale = Locale.objects.first()
+        Translation.objects.create(locale=locale, text="duplicate")
+        with self.assertRaises(IntegrityError) as context:
+            with transaction.atomic():
+                Translation.objects.create(locale=locale, text="duplicate")
+
+        self.assertTrue(
+            violates_constraint(
+                context.exception, "unique_locale_id_text_if_not_deleted"
+            )
+        )
+        parameters = resolve_exception_handling_parameters(context.exception)
+        self.assertEqual(parameters.response_status, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            parameters.response_information_code, ErrorCode.DUPLICATE_KEY_ERROR
+        )
+
+
+class ModelConverterTestCase(CustomIntegrationTestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_common_models()
+        self.detailed_fields = {"user": {"fields": ["id", "email"]}, "buyables": {}}
+
+    def create_purchases(self, count: int):
+        purchases = baker.make(Purchase, user=self.user, _quantity=count)
+        for purchase in purchases:
+            purchase.buyables.add(self.product)
+        return purchases
+
+    def test_plan_output_matches_field_by_field_conversion(self):
+        purchase = self.create_purchases(1)[0]
+        expected = {
+            field.name: field.value_from_object(purchase)
+            for field in Purchase._meta.concrete_fields
+        }
+        expected["user"] = {"id": self.user.id, "email": self.user.email}
+        expected["products"] = [
+            {
+                field.name: field.value_from_object(self.product)
+                for field in type(self.product)._meta.concrete_fields
+            }
+        ]
+
+        arguments = {
+            "detailed_fields": self.detailed_fields,
+            "fields_as": {"buyables": "products"},
+        }
+        self.assertEqual(ModelConverter.model_to_dict(purchase, **arguments), expected)
+        # Second call goes through the cached plan
+        self.assertIs(
+            ModelConverter.get_plan(Purchase, **arguments),
+            ModelConverter.get_plan(Purchase, **arguments),
+        )
+        self.assertEqual(ModelConverter.model_to_dict(purchase, **arguments), expected)
+
+    def test_models_to_dicts_queries_do_not_grow_with_instances(self):
+        self.create_purchases(1)
+        with CaptureQueriesContext(connection) as single_queries:
+            ModelConverter.models_to_dicts(
+                Purchase.objects.all(), detailed_fields=self.detailed_fields
+            )
+
+        self.create_purchases(4)
+        with self.assertNumQueries(len(single_queries)):
+            dicts = ModelConverter.models_to_dicts(
+                Purchase.objects.all(), detailed_fields=self.detailed_fields
+            )
+        self.assertEqual(len(dicts), 5)
+        for purchase_dict in dicts:
+            self.assertEqual(purchase_dict["user"]["email"], self.user.email)
+            self.assertEqual(purchase_dict["buyables"][0]["id"], self.product.id)
+
+    @patch.object(ModelConverter, "PLAN_CACHE_SIZE", 2)
+    @patch.object(ModelConverter, "_plans", OrderedDict())
+    def test_plan_cache_evicts_least_recently_used(self):
+        id_plan = ModelConverter.get_plan(Purchase, fields=["id"])
+        user_plan = ModelConverter.get_plan(Purchase, fields=["user"])
+        self.assertIs(ModelConverter.get_plan(Purchase, fields=["id"]), id_plan)
+
+        ModelConverter.get_plan(Purchase, fields=["id", "user"])
+
+        self.assertEqual(len(ModelConverter._plans), 2)
+        self.assertIs(ModelConverter.get_plan(Purchase, fields=["id"]), id_plan)
+        self.assertIsNot(ModelConverter.get_plan(Purchase, fields=["user"]), user_plan)
+
+
+class IsRoleOrOwnerTestCase(CustomIntegrationTestCase):
+    def create_request(self, payload):
+        request = Request(
+            APIRequestFactory().post("/", {}, format="json"),
+            parsers=[JSONParser()],
+            parser_context={"kwargs": {}},
+        )
+        request.auth = SimpleNamespace(payload=payload)
+        return request
+
+    def test_owner_writes_own_component(self):
+        request = self.create_request(
+            {
+                "role": UserRole.STUDENT.value,
+                "user_id": "381c8642-6135-4efe-a487-4b93a4217c06",
+            }
+        )
+        self.assertTrue(is_role_or_owner(request, UserRole.ADMIN))
+
+    def test_token_without_user_is_not_an_owner(self):
+        request = self.create_request({"role": UserRole.STUDENT.value})
+        self.assertFalse(is_role_or_owner(request, UserRole.ADMIN))
+
+
+class HTTPClientRegistryTestCase(CustomIntegrationTestCase):
+    def setUp(self):
+        super().setUp()
+        self.registry = HTTPClientRegistry()
+        self.addCleanup(self.registry.close_all)
+
+    def test_client_is_reused_per_base_url(self):
+        client = self.registry.get("https://api.netgsm.com.tr")
+        self.assertIs(client, self.registry.get("https://api.netgsm.com.tr"))
+        self.assertIsNot(
+            client, self.registry.get("https://api.storekit.itunes.apple.com")
+        )
+        self.assertEqual(client.timeout.read, 5)
+
+    def test_clients_are_rebuilt_after_fork(self):
+        client = self.registry.get("https://api.netgsm.com.tr")
+        with patch("utils.http_clients.os.getpid", return_value=-1):
+            forked_client = self.registry.get("https://api.netgsm.com.tr")
+            self.assertIsNot(client, forked_client)
+            self.assertIs(forked_client, self.registry.get("https://api.netgsm.com.tr"))
+        client.close()
+
+
+class QueuedLogSinkTestCase(CustomIntegrationTestCase):
+    def create_sink(self, **kwargs) -> QueuedLogSink:
+        sink = QueuedLogSink(**kwargs)
+        # Keep records in the queue instead of handing them to a writer thread
+        patcher = patch.object(sink, "_ensure_writer")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return sink
+
+    def create_record(self, level: str = "info", **kwargs) -> QueuedLogRecord:
+        return QueuedLogRecord(self.struct_logger, level, "event", {}, **kwargs)
+
+    def setUp(self):
+        super().setUp()
+        self.struct_logger = Mock()
+
+    def test_full_queue_drops_records(self):
+        sink = self.create_sink(max_queue_size=2, high_watermark=1.0)
+        for _ in range(3):
+            sink.emit(self.create_record())
+
+        stats = sink.stats()
+        self.assertEqual(stats["enqueued"], 2)
+        self.assertEqual(stats["dropped"], 1)
+        self.assertEqual(stats["queued"], 2)
+
+    def test_success_records_are_sampled_under_pressure(self):
+        sink = self.create_sink(
+            max_queue_size=10, high_watermark=0.2, pressure_sample_rate=0
+        )
+        for _ in range(3):
+            sink.emit(self.create_record())
+        sink.emit(self.create_record(level="error"))
+
+        stats = sink.stats()
+        self.assertEqual(stats["enqueued"], 3)
+        self.assertEqual(stats["sampled_out"], 1)
+
+    def test_flush_writes_queued_records_and_reports_losses(self):
+        sink = self.create_sink(max_queue_size=2, high_watermark=1.0)
+        for _ in range(3):
+            sink.emit(self.create_record())
+        sink.flush()
+
+        stats = sink.stats()
+        self.assertEqual(stats["written"], 2)
+        self.assertEqual(stats["queued"], 0)
+        self.assertEqual(self.struct_logger.info.call_count, 2)
+        self.struct_logger.warning.assert_called_once_with(
+            "Log records were dropped under pressure.",
+            dropped=1,
+            sampled_out=0,
+            queued=0,
+        )
+
+    def test_queued_records_are_drained_at_exit(self):
+        sink = QueuedLogSink()
+        with patch.object(sink, "_run"), patch(
+            "common.log_pipeline.queued_log_sink.atexit.register"
+        ) as m_register:
+            sink.emit(self.create_record())
+            sink._writer.join()
+            sink.emit(self.create_record())
+        m_register.assert_called_once_with(sink.flush)
+
+        m_register.call_args.args[0]()
+        self.assertEqual(sink.stats()["written"], 2)
+        self.assertEqual(self.struct_logger.info.call_count, 2)
+
+    def test_record_keeps_formatted_traceback_only(self):
+        try:
+            raise ValueError("failed")
+        except ValueError as e:
+            record = self.create_record(
+                level="error", exc_info=(e.__class__, e, e.__traceback__)
+            )
+
+        self.assertFalse(hasattr(record, "exc_info"))
+        self.assertIn("ValueError: failed", record.fields["exception_stack_trace"])
+        record.write()
+        self.struct_logger.error.assert_called_once_with(
+            "event", exception_stack_trace=record.fields["exception_stack_trace"]
+        )
+
+
+@override_settings(
+    LOG_SAMPLING={
+        "DEFAULT_SAMPLE_RATE": 1.0,
+        "MAX_PAYLOAD_SIZE": None,
+        "VIEWS": {
+            "SampledView.list": {"SAMPLE_RATE": 0},
+            "TruncatedView.create": {"MAX_PAYLOAD_SIZE": 20},
+        },
+    }
+)
+class LogSamplerTestCase(CustomIntegrationTestCase):
+    def setUp(self):
+        super().setUp()
+        sampler_patcher = patch(
+            "common.response.view_response.log_sampler", LogSampler()
+        )
+        sampler_patcher.start()
+        self.addCleanup(sampler_patcher.stop)
+        sink_patcher = patch("common.response.view_response.log_sink")
+        self.m_log_sink = sink_patcher.start()
+        self.addCleanup(sink_patcher.stop)
+
+        # Staff requests log their body
+        context_request = SimpleNamespace(
+            auth=SimpleNamespace(payload={"role": UserRole.ADMIN.value})
+        )
+        token = GlobalContextMiddleware.set_global_context(
+            GlobalContext(context_request)
+        )
+        self.addCleanup(GlobalContextMiddleware.del_global_context, token)
+
+        self.request_body = {"text": "a" * 50}
+        self.request = Mock()
+        self.request.method = "POST"
+        self.request.get_full_path.return_value = "/translations/"
+        self.m_data = PropertyMock(return_value=self.request_body)
+        type(self.request).data = self.m_data
+
+    def log(self, view_name: str, method_name: str, view_response=None):
+        log_view_response(
+            struct_logger=Mock(),
+            view_name=view_name,
+            method_name=method_name,
+            request=self.request,
+            view_response=view_response or ViewSuccessResponse(),
+        )
+
+    def test_zero_sample_rate_skips_logging_and_request_data(self):
+        self.log("SampledView", "list")
+
+        self.m_log_sink.emit.assert_not_called()
+        self.m_data.assert_not_called()
+
+    def test_zero_sample_rate_still_logs_failures(self):
+        self.log(
+            "SampledView", "list", ViewValidationFailureResponse("Invalid request")
+        )
+
+        self.m_log_sink.emit.assert_called_once()
+
+    def test_full_sample_rate_logs_request_body(self):
+        self.log("LoggedView", "list")
+
+        self.m_log_sink.emit.assert_called_once()
+        record = self.m_log_sink.emit.call_args.args[0]
+        self.assertEqual(record.fields["request_body"], self.request_body)
+        self.assertEqual(record.fields["request_path"], "/translations/")
+
+    def test_payload_over_the_limit_is_truncated(self):
+        self.log("TruncatedView", "create")
+
+        record = self.m_log_sink.emit.call_args.args[0]
+        serialized = '{"text": "' + "a" * 50 + '"}'
+        self.assertEqual(
+            record.fields["request_body"],
+            f"{serialized[:20]}...(truncated {len(serialized)} chars)",
+        )
+
+
+@override_settings(USE_TZ=False)
+class ORJSONRendererTestCase(CustomIntegrationTestCase):
+    def setUp(self):
+        super().setUp()
+        created = datetime.datetime(2024, 1, 2, 3, 4, 5, 123456)
+        self.data = {
+            "id": uuid.UUID("381c8642-6135-4efe-a487-4b93a4217c06"),
+            "price": serializers.DecimalField(
+                max_digits=5, decimal_places=2
+            ).to_representation(Decimal("12.5")),
+            "amount": Decimal("12.50"),
+            "created": created,
+            "created_field": serializers.DateTimeField().to_representation(created),
+            "date": created.date(),
+            "duration": datetime.timedelta(minutes=1),
+            "message": _("Success"),
+            "nested": [{"count": 1, "ratio": 0.5, "flag": True, "empty": None}],
+        }
+
+    def test_output_matches_json_renderer(self):
+        rendered = json.loads(ORJSONRenderer().render(self.data))
+
+        self.assertEqual(rendered, json.loads(JSONRenderer().render(self.data)))
+        self.assertEqual(rendered["price"], "12.50")
+        self.assertEqual(rendered["created"], "2024-01-02T03:04:05.123456")
+        self.assertEqual(rendered["created_field"], "2024-01-02T03:04:05.123456")
+        self.assertEqual(rendered["message"], "Success")
+
+    def test_phone_number_is_rendered_as_e164(self):
+        phone = PhoneNumber.from_string("+905321234567")
+        rendered = json.loads(ORJSONRenderer().render({"phone": phone}))
+        self.assertEqual(rendered["phone"], "+905321234567")
+
+    def test_rendered_output_parses_back(self):
+        rendered = ORJSONRenderer().render(self.data)
+
+        self.assertEqual(
+            ORJSONParser().parse(BytesIO(rendered)),
+            JSONParser().parse(BytesIO(JSONRenderer().render(self.data))),
+        )
+
+    def test_parser_decodes_declared_charset(self):
+        body = '{"text": "Merhaba Dünya"}'.encode("latin-1")
+        parsed = ORJSONParser().parse(
+            BytesIO(body), parser_context={"encoding": "latin-1"}
+        )
+        self.assertEqual(parsed, {"text": "Merhaba Dünya"})
+
+
+class LocaleRegistryTestCase(CustomIntegrationTestCase):
+    def setUp(self):
+        super().setUp()
+        self.locale = baker.make(Locale, name="German (Germany)", code="de-DE")
+
+    def test_locale_save_refreshes_lookups(self):
+        self.assertEqual(locale_registry.get_by_code("de-DE").id, self.locale.id)
+
+        self.locale.code = "de-AT"
+        self.locale.save()
+
+        self.assertIsNone(locale_registry.get_by_code("de-DE"))
+        self.assertEqual(locale_registry.get_by_code("de-AT").id, self.locale.id)
+        self.assertEqual(locale_registry.get_by_id(self.locale.id).code, "de-AT")
+
+    def test_locale_delete_refreshes_lookups(self):
+        self.assertIsNotNone(locale_registry.get_by_id(self.locale.id))
+        locale_id = self.locale.id
+
+        self.locale.delete()
+
+        self.assertIsNone(locale_registry.get_by_id(locale_id))
+        self.assertIsNone(locale_registry.get_by_code("de-DE"))
+
+    def test_defaults_resolve_without_query(self):
+        Locale.get_default()
+        Locale.get_default_english()
+        Locale.get_default()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(Locale.get_default().code, "tr-TR")
+            self.assertEqual(Locale.get_default_english().code, "en-US")
+
+    def test_lookups_return_copies(self):
+        locale = locale_registry.get_by_code("de-DE")
+        locale.name = "Changed"
+
+        self.assertEqual(locale_registry.get_by_code("de-DE").name, "German (Germany)")
+        self.assertEqual(
+            locale_registry.get_by_id(self.locale.id).name, self.locale.name
+        )
+
+    @patch("common.caches.locale_registry.time.monotonic")
+    def test_reload_on_miss_is_throttled(self, m_monotonic):
+        registry = LocaleRegistry()
+        m_monotonic.return_value = 100
+        registry.get_by_code("de-DE")
+        # bulk_create sends no post_save, so only a reload finds the locale
+        Locale.objects.bulk_create([Locale(name="French (France)", code="fr-FR")])
+
+        m_monotonic.return_value = 100 + registry.reload_on_miss_interval / 2
+        with self.assertNumQueries(0):
+            self.assertIsNone(registry.get_by_code("fr-FR"))
+
+        m_monotonic.return_value = 100 + registry.reload_on_miss_interval
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(registry.get_by_code("fr-FR"))
+
+
+class GlobalContextMiddlewareTestCase(CustomIntegrationTestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+
+    def test_context_is_reset_after_request(self):
+        request = self.factory.get("/")
+
+        def get_response(current_request):
+            context = GlobalContextMiddleware.get_global_context()
+            self.assertIs(context.request, current_request)
+            return HttpResponse()
+
+        GlobalContextMiddleware(get_response)(request)
+
+        self.assertIsNone(GlobalContextMiddleware.get_global_context())
+
+    def test_context_is_reset_when_view_raises(self):
+        def get_response(current_request):
+            raise ValueError("view failed")
+
+        with self.assertRaises(ValueError):
+            GlobalContextMiddleware(get_response)(self.factory.get("/"))
+
+        self.assertIsNone(GlobalContextMiddleware.get_global_context())
+
+    def test_concurrent_async_requests_keep_their_own_context(self):
+        requests = [self.factory.get(f"/{index}") for index in range(3)]
+        seen = []
+
+        async def run():
+            entered = asyncio.Event()
+            pending = len(requests)
+
+            async def get_response(current_request):
+                nonlocal pending
+                pending -= 1
+                if pending == 0:
+                    entered.set()
+                # Every request is inside the middleware before any reads back
+                await entered.wait()
+                context = GlobalContextMiddleware.get_global_context()
+                seen.append((current_request, context.request))
+                return HttpResponse()
+
+            middleware = GlobalContextMiddleware(get_response)
+            await asyncio.gather(*(middleware(request) for request in requests))
+            return GlobalContextMiddleware.get_global_context()
+
+        self.assertIsNone(asyncio.run(run()))
+        self.assertEqual(len(seen), len(requests))
+        for current_request, context_request in seen:
+            self.assertIs(context_request, current_request)
@@ -8,6 +8,11 @@ class LocaleCode(models.TextChoices):
     EN = "en"
 
 
+class TranslationSearchMode(models.TextChoices):
+    CONTAINS = "contains"
+    TRIGRAM = "trigram"
+
+
 class FileType(models.TextChoices):
     IMAGE = auto()
     AUDIO = auto()
@@ -1,6 +1,6 @@
+from django.contrib.postgres.search import TrigramSimilarity
 from django.db import IntegrityError
-from django.db.models import Q, Count
-from django.http import Http404
+from django.db.models import Q, F
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -8,16 +8,12 @@ from rest_framework.request import Request
 from rest_framework.viewsets import ModelViewSet
 from structlog import get_logger
 
+from common.caches.locale_registry import locale_registry
 from common.custom_exceptions.custom_exception import CustomException
 from common.models import Translation, TranslatedFile, Locale
 from common.permissions.generic_permissions import EditorAndUp, EditorAndUpOrReadOnly
 from common.response.response_information_codes.error_code import ErrorCode
-from common.response.response_information_codes.message_code import MessageCode
-from common.response.view_response import (
-    ViewResponse,
-    log_view_response,
-    ViewResponseNoContent,
-)
+from common.response.envelope_response_mixin import EnvelopeResponseMixin
 from common.serializers import (
     TranslationSerializer,
     TranslatedFileSerializer,
@@ -26,13 +22,14 @@ from common.serializers import (
     LocaleSerializer,
 )
 from common.services import TranslationService, TranslatedFileService
+from common.types import TranslationSearchMode
 from utils.converters import ValueConverter
 from django.utils.translation import gettext_lazy as _
 
 log = get_logger(__name__)
 
 
-class TranslationViewSet(ModelViewSet):
+class TranslationViewSet(EnvelopeResponseMixin, ModelViewSet):
     permission_classes = [EditorAndUp]
     serializer_class = TranslationSerializer
     lookup_field = "id"
@@ -43,62 +40,52 @@ class TranslationViewSet(ModelViewSet):
         locale_code = params.get("locale_code", None)
         language = params.get("language", None)
         text = params.get("text", None)
+        search_mode = params.get("search_mode", TranslationSearchMode.CONTAINS.value)
         is_root = params.get("is_root", None)
         order_by = params.get("order_by", None)
         query_set = Translation.objects.all()
         if locale_code:
-            query_set = query_set.filter(locale__code=locale_code)
+            query_set = query_set.filter(locale_id=locale_registry.get_id(locale_code))
         if language:
-            query_set = query_set.filter(locale__code=language)
+            query_set = query_set.filter(locale_id=locale_registry.get_id(language))
         if text:
-            query_set = query_set.filter(Q(text__icontains=text) | Q(root__text=text))
+            query_set = self.search_text(query_set, text, search_mode)
         if is_root is not None and ValueConverter.str2bool(is_root, empty_is_true=True):
-            query_set = query_set.annotate(nchild=Count("translations")).filter(
-                nchild__gt=0
-            )
+            query_set = query_set.filter(root_id=F("id"))
 
         if order_by:
             query_set.order_by(order_by)
 
         return query_set.select_related("root").select_related("locale")
 
-    def retrieve(self, request, *args, **kwargs):
-        response = super().retrieve(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.RETRIEVE_CONTENT_SUCCESS,
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="retrieve",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.LIST_CONTENT_SUCCESS,
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="list",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
+    @staticmethod
+    def search_text(query_set, text: str, search_mode: str):
+        """
+        Contains mode matches case-insensitively through the UPPER(text) trigram
+        index, trigram mode also matches similar texts through the trigram index
+        of text and ranks them by similarity
+        """
+        if search_mode == TranslationSearchMode.CONTAINS:
+            return query_set.filter(
+                Q(text__icontains=text)
+                | Q(root_id__in=Translation.objects.filter(text=text).values("id"))
+            )
+        if search_mode == TranslationSearchMode.TRIGRAM:
+            return (
+                query_set.filter(
+                    Q(text__trigram_similar=text) | Q(text__icontains=text)
+                )
+                .annotate(similarity=TrigramSimilarity("text", text))
+                .order_by("-similarity", "id")
+            )
+        raise CustomException(
+            detail={
+                "search_mode": f"Search mode must be one of {TranslationSearchMode.values}"
+            },
+            code=ErrorCode.GENERAL_VALIDATION_ERROR,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            message=_("Invalid search mode"),
         )
-        return view_response.rest_response
 
     def handle_duplicate_locale_text_index(self, request: Request) -> Response:
         translation = Translation.objects.filter(
@@ -140,64 +127,7 @@ class TranslationViewSet(ModelViewSet):
             else:
                 raise create_exception
 
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.CREATE_CONTENT_SUCCESS,
-            response_message=_("Created successfully!"),
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="create",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def partial_update(self, request, *args, **kwargs):
-        response = super().partial_update(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.UPDATE_CONTENT_SUCCESS,
-            response_message=_("Updated successfully!"),
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="partial_update",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def destroy(self, request, *args, **kwargs):
-        try:
-            super().destroy(request, *args, **kwargs)
-            view_response = ViewResponseNoContent(
-                response_message=_("Deleted successfully!")
-            )
-        except Http404:
-            view_response = ViewResponseNoContent(
-                response_message=_("Deleted successfully!")
-            )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="destroy",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
+        return response
 
     @action(detail=False, methods=["post"])
     def bulk_create(self, request, *args, **kwargs):
@@ -209,26 +139,10 @@ class TranslationViewSet(ModelViewSet):
         translations = TranslationService.bulk_create(
             serializer.validated_data, query_params
         )
-        view_response = ViewResponse(
-            response_body=translations,
-            response_status=status_code,
-            is_successful=True,
-            response_information_code=MessageCode.CREATE_CONTENT_SUCCESS,
-            response_message=_("Created successfully!"),
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="bulk_create",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
+        return Response(translations, status=status_code)
 
 
-class TranslatedFileViewSet(ModelViewSet):
+class TranslatedFileViewSet(EnvelopeResponseMixin, ModelViewSet):
     permission_classes = [EditorAndUp]
     serializer_class = TranslatedFileSerializer
     lookup_field = "id"
@@ -243,120 +157,19 @@ class TranslatedFileViewSet(ModelViewSet):
         name = params.get("name", None)
         query_set = TranslatedFile.objects.all()
         if locale_code:
-            query_set = query_set.filter(locale__code=locale_code)
+            query_set = query_set.filter(locale_id=locale_registry.get_id(locale_code))
         if language:
-            query_set = query_set.filter(locale__code=language)
+            query_set = query_set.filter(locale_id=locale_registry.get_id(language))
         if name:
             query_set = query_set.filter(name__icontains=name)
         if is_root is not None and ValueConverter.str2bool(is_root, empty_is_true=True):
-            query_set = query_set.annotate(nchild=Count("translations")).filter(
-                nchild__gt=0
-            )
+            query_set = query_set.filter(root_id=F("id"))
 
         if order_by:
             query_set.order_by(order_by)
 
         return query_set.select_related("root").select_related("locale")
 
-    def retrieve(self, request, *args, **kwargs):
-        response = super().retrieve(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.RETRIEVE_CONTENT_SUCCESS,
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="retrieve",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.LIST_CONTENT_SUCCESS,
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="list",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def create(self, request, *args, **kwargs):
-        response = super().create(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.CREATE_CONTENT_SUCCESS,
-            response_message=_("Created successfully!"),
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="create",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def partial_update(self, request, *args, **kwargs):
-        response = super().partial_update(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.UPDATE_CONTENT_SUCCESS,
-            response_message=_("Updated successfully!"),
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="partial_update",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def destroy(self, request, *args, **kwargs):
-        try:
-            super().destroy(request, *args, **kwargs)
-            view_response = ViewResponseNoContent(
-                response_message=_("Deleted successfully!")
-            )
-        except Http404:
-            view_response = ViewResponseNoContent(
-                response_message=_("Deleted successfully!")
-            )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="destroy",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
     @action(detail=False, methods=["post"])
     def bulk_create(self, request, *args, **kwargs):
         status_code = status.HTTP_201_CREATED
@@ -364,104 +177,12 @@ class TranslatedFileViewSet(ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         translations = TranslatedFileService.bulk_create(serializer.validated_data)
-        view_response = ViewResponse(
-            response_body=translations,
-            response_status=status_code,
-            is_successful=True,
-            response_information_code=MessageCode.CREATE_CONTENT_SUCCESS,
-            response_message=_("Created successfully!"),
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="bulk_create",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
+        return Response(translations, status=status_code)
 
 
-class LocaleViewSet(ModelViewSet):
+class LocaleViewSet(EnvelopeResponseMixin, ModelViewSet):
     permission_classes = [EditorAndUpOrReadOnly]
     serializer_class = LocaleSerializer
     queryset = Locale.objects.all()
     lookup_field = "id"
-
-    def retrieve(self, request, *args, **kwargs):
-        response = super().retrieve(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.RETRIEVE_CONTENT_SUCCESS,
-        )
-        return view_response.rest_response
-
-    def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.LIST_CONTENT_SUCCESS,
-        )
-        return view_response.rest_response
-
-    def create(self, request, *args, **kwargs):
-        response = super().create(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.CREATE_CONTENT_SUCCESS,
-            response_message=_("Created successfully!"),
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="create",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def partial_update(self, request, *args, **kwargs):
-        response = super().partial_update(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.LIST_CONTENT_SUCCESS,
-            response_message=_("Updated successfully!"),
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="partial_update",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def destroy(self, request, *args, **kwargs):
-        try:
-            super().destroy(request, *args, **kwargs)
-            view_response = ViewResponseNoContent(_("Deleted successfully!"))
-        except Http404:
-            view_response = ViewResponseNoContent(_("Deleted successfully!"))
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="destroy",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
+    unlogged_actions = ("list", "retrieve")
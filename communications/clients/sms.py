@@ -1,7 +1,8 @@
-import httpx
 from django.conf import settings
 from structlog import get_logger
 
+from utils.http_clients import get_http_client
+
 log = get_logger(__name__)
 
 
@@ -25,8 +26,8 @@ class NetgsmSMSClient(BaseSMSClient):
             "msgheader": header,
         }
 
-        response = httpx.get(
-            "https://api.netgsm.com.tr/sms/send/get/", params=query_params
+        response = get_http_client("https://api.netgsm.com.tr").get(
+            "/sms/send/get/", params=query_params
         )
         success = not self.is_netgsm_error_code(response.text)
         log.info(
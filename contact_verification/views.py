@@ -45,9 +45,7 @@ class ContactVerificationViewSet(GenericViewSet):
             struct_logger=log,
             view_name=self.__class__.__name__,
             method_name="create",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
+            request=request,
             view_response=view_response,
         )
 
@@ -81,9 +79,7 @@ class CodeVerificationViewSet(GenericViewSet):
             struct_logger=log,
             view_name=self.__class__.__name__,
             method_name="create",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
+            request=request,
             view_response=view_response,
         )
 
@@ -112,9 +108,7 @@ class CodeVerificationViewSet(GenericViewSet):
             struct_logger=log,
             view_name=self.__class__.__name__,
             method_name="create",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
+            request=request,
             view_response=view_response,
         )
 
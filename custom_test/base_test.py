@@ -1,5 +1,6 @@
 import uuid
 
+from django.core.cache import cache
 from django.db.models import Q
 from django.test import TestCase
 from django.urls import reverse
@@ -8,16 +9,24 @@ from model_bakery import baker
 from rest_framework.test import APITestCase
 
 from authy.models import Account
+from common.caches.locale_registry import locale_registry
+from common.caches.translation_cache import translation_cache
 from common.models import Translation
 from common.models import Locale
 from payment.models import Buyable
 from user.models import User
 from user.types import UserRole
+from vendor.clients.googleplay import android_publisher_services
 
 
 class CustomIntegrationTestCase(TestCase):
     def setUp(self):
         self._phone_end = 0
+        translation_cache.clear()
+        locale_registry.clear()
+        # Account and subscription caches outlive the rolled back test data
+        cache.clear()
+        android_publisher_services.clear()
 
     def generate_valid_phone_number(self):
         phone = 5550000000 + self._phone_end
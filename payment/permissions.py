@@ -1,5 +1,6 @@
 from rest_framework import permissions
 
+from common.permissions.principal import get_principal
 from user.types import UserRole
 
 
@@ -9,13 +10,7 @@ class ReferenceCodePermission(permissions.BasePermission):
     """
 
     def has_permission(self, request, view):
-        auth = request.auth
         if view.action in ["verify_reference_code"]:
             return True
 
-        if auth:
-            jwt_payload = auth.payload
-            role = UserRole(jwt_payload.get("role", None) or UserRole.NONE.value)
-            if role and role >= UserRole.EDITOR:
-                return True
-        return False
+        return get_principal(request).has_role(UserRole.EDITOR)
@@ -21,6 +21,7 @@ from payment.verifiers.googleplay import GooglePlayVerifier, GooglePlayValidator
 from subscription.models import UserSubscription
 from user.models import User
 from utils.converters import ValueConverter
+from utils.db import violates_constraint
 from vendor.clients.appstore import AppStoreInAppPurchaseAPIClient, AppStoreConnectAPI
 
 log = get_logger(__name__)
@@ -108,7 +109,10 @@ class MobilePurchaseStrategy:
             )
         except IntegrityError as e:
             # Cover the case of repeated requests
-            if "unique_payment_transaction_payment_vendor_key_transaction_id" in str(e):
+            if violates_constraint(
+                e,
+                "unique_payment_transaction_payment_vendor_key_transaction_id_if_not_deleted",
+            ):
                 return
             raise e
 
@@ -1,12 +1,21 @@
+import datetime
 from decimal import Decimal
 
+from django.test import override_settings
 from django.urls import reverse
+from mock import patch
 from model_bakery import baker
 from rest_framework import status
 
-from payment.models import Buyable
+from payment.models import Buyable, Purchase
 from payment.types import SubscriptionPeriod, BuyableType
 from custom_test.base_test import CustomIntegrationTestCase
+from subscription.caches.subscription_snapshot_cache import (
+    SubscriptionSnapshotCache,
+    subscription_snapshot_cache,
+)
+from subscription.models import UserSubscription
+from subscription.types import SubscriptionStatus
 from user.types import UserRole
 
 
@@ -34,6 +43,57 @@ class PurchaseTestCase(CustomIntegrationTestCase):
         pass  # TODO after store accounts are created
 
 
+class SubscriptionSnapshotCacheTestCase(CustomIntegrationTestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_common_models()
+        purchase = baker.make(Purchase, user=self.user)
+        self.subscription = baker.make(
+            UserSubscription,
+            user=self.user,
+            buyable=self.product,
+            purchase=purchase,
+            start_date=datetime.datetime.utcnow() - datetime.timedelta(days=1),
+            expiration_date=datetime.datetime.utcnow() + datetime.timedelta(days=29),
+            status=SubscriptionStatus.ACTIVE,
+        )
+
+    def test_snapshot_is_invalidated_on_subscription_save(self):
+        snapshot = subscription_snapshot_cache.get_json(self.user.id)
+        self.assertEqual(snapshot["status"], SubscriptionStatus.ACTIVE)
+
+        self.subscription.status = SubscriptionStatus.CANCELED
+        self.subscription.save()
+
+        snapshot = subscription_snapshot_cache.get_json(self.user.id)
+        self.assertEqual(snapshot["status"], SubscriptionStatus.CANCELED)
+
+    def test_snapshot_is_loaded_on_every_read_without_a_shared_cache(self):
+        with self.assertNumQueries(1):
+            subscription_snapshot_cache.get_json(self.user.id)
+        with self.assertNumQueries(1):
+            subscription_snapshot_cache.get_json(self.user.id)
+
+    @override_settings(
+        SUBSCRIPTION_SNAPSHOT_CACHE={"CACHE_ALIAS": "default", "TIMEOUT": 60 * 60}
+    )
+    def test_shared_cache_snapshot_is_invalidated_on_subscription_save(self):
+        cache = SubscriptionSnapshotCache()
+        with patch("subscription.handlers.subscription_snapshot_cache", cache):
+            self.assertEqual(
+                cache.get_json(self.user.id)["status"], SubscriptionStatus.ACTIVE
+            )
+            with self.assertNumQueries(0):
+                cache.get_json(self.user.id)
+
+            self.subscription.status = SubscriptionStatus.CANCELED
+            self.subscription.save()
+
+            self.assertEqual(
+                cache.get_json(self.user.id)["status"], SubscriptionStatus.CANCELED
+            )
+
+
 class BuyableTestCase(CustomIntegrationTestCase):
 
     def setUp(self):
@@ -4,12 +4,11 @@ import json
 import os
 from typing import Union
 
-import httplib2
 import rsa
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from oauth2client.service_account import ServiceAccountCredentials
 
+from vendor.clients.googleplay import android_publisher_services
 from .errors import GoogleError, InAppPyError, InAppPyValidationError
 
 
@@ -159,12 +158,14 @@ class GooglePlayVerifier:
         )
 
     def _authorize(self):
-        http = httplib2.Http(timeout=self.http_timeout)
-        credentials = self._create_credentials(
-            self.play_console_credentials, self.DEFAULT_AUTH_SCOPE
+        key = android_publisher_services.get_key(self.play_console_credentials)
+        credentials = android_publisher_services.get_credentials(
+            key,
+            lambda: self._create_credentials(
+                self.play_console_credentials, self.DEFAULT_AUTH_SCOPE
+            ),
         )
-        http = credentials.authorize(http)
-        return http
+        return android_publisher_services.get_http(key, credentials, self.http_timeout)
 
     def check_purchase_subscription(
         self, purchase_token: str, product_sku: str, service
@@ -205,7 +206,10 @@ class GooglePlayVerifier:
     def verify(
         self, purchase_token: str, product_sku: str, is_subscription: bool = False
     ) -> dict:
-        service = build("androidpublisher", "v3", http=self.http)
+        service = android_publisher_services.get_service(
+            android_publisher_services.get_key(self.play_console_credentials),
+            self.http,
+        )
 
         if is_subscription:
             result = self.check_purchase_subscription(
@@ -234,7 +238,10 @@ class GooglePlayVerifier:
     ) -> GoogleVerificationResult:
         """Verifies by returning verification result instead of raising an error,
         basically it's and better alternative to verify method."""
-        service = build("androidpublisher", "v3", http=self.http)
+        service = android_publisher_services.get_service(
+            android_publisher_services.get_key(self.play_console_credentials),
+            self.http,
+        )
         verification_result = GoogleVerificationResult({}, False, False)
 
         if is_subscription:
@@ -1,20 +1,16 @@
-from django.http import Http404
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
 from structlog import get_logger
-from django.utils.translation import gettext_lazy as _
 
 from common.middlewares.global_context_middleware import GlobalContextMiddleware
 from common.models import Translation
 from common.permissions.generic_permissions import ContentPermission
-from common.response.response_information_codes.message_code import MessageCode
+from common.response.envelope_response_mixin import EnvelopeResponseMixin
 from common.response.view_response import (
     log_view_response,
     ViewSuccessResponse,
-    ViewResponse,
-    ViewResponseNoContent,
 )
 from payment.models import Buyable
 from payment.serializers import (
@@ -22,11 +18,9 @@ from payment.serializers import (
     BuyableSerializer,
 )
 from payment.services import PaymentService
+from payment.types import PaymentVendor
 from utils.built_in_overrides import flat_map
-from vendor.notification_handlers.subscription_notification_handlers import (
-    GoogleNotificationHandler,
-    AppleNotificationHandler,
-)
+from vendor.services import StoreNotificationInboxService
 
 log = get_logger(__name__)
 
@@ -48,15 +42,13 @@ class PaymentViewSet(GenericViewSet):
             struct_logger=log,
             view_name=self.__class__.__name__,
             method_name="create",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
+            request=request,
             view_response=view_response,
         )
         return view_response.rest_response
 
 
-class BuyableViewSet(ModelViewSet):
+class BuyableViewSet(EnvelopeResponseMixin, ModelViewSet):
     permission_classes = [ContentPermission]
     serializer_class = BuyableSerializer
     queryset = (
@@ -93,22 +85,8 @@ class BuyableViewSet(ModelViewSet):
                 response.data.get("description_id")
             ),
         }
-        view_response = ViewResponse(
-            response_body=result,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.RETRIEVE_CONTENT_SUCCESS,
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="retrieve",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
+        response.data = result
+        return response
 
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
@@ -155,83 +133,8 @@ class BuyableViewSet(ModelViewSet):
             }
             for buyable in response.data
         ]
-        view_response = ViewResponse(
-            response_body=result,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.LIST_CONTENT_SUCCESS,
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="list",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def create(self, request, *args, **kwargs):
-        response = super().create(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.CREATE_CONTENT_SUCCESS,
-            response_message=_("Created successfully!"),
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="create",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def partial_update(self, request, *args, **kwargs):
-        response = super().partial_update(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.UPDATE_CONTENT_SUCCESS,
-            response_message=_("Updated successfully!"),
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="partial_update",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def destroy(self, request, *args, **kwargs):
-        try:
-            super().destroy(request, *args, **kwargs)
-            view_response = ViewResponseNoContent(
-                response_message=_("Deleted successfully!")
-            )
-        except Http404:
-            view_response = ViewResponseNoContent(
-                response_message=_("Deleted successfully!")
-            )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="destroy",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
+        response.data = result
+        return response
 
 
 class GooglePlayWebhookViewSet(GenericViewSet):
@@ -240,15 +143,7 @@ class GooglePlayWebhookViewSet(GenericViewSet):
     @swagger_auto_schema(auto_schema=None)
     def create(self, request, *args, **kwargs):
         log.info("Google Play webhook is received", request=str(request.data))
-        try:
-            handler = GoogleNotificationHandler(request.data)
-            handler.handle()
-        except Exception as e:
-            log.error(
-                "Unhandled Google notification",
-                request_data=request.data,
-                exception=str(e),
-            )
+        StoreNotificationInboxService.enqueue(PaymentVendor.GOOGLE, request.data)
         view_response = ViewSuccessResponse()
         return view_response.rest_response
 
@@ -259,14 +154,6 @@ class AppStoreWebhookViewSet(GenericViewSet):
     @swagger_auto_schema(auto_schema=None)
     def create(self, request, *args, **kwargs):
         log.info("App Store webhook is received", request=str(request.data))
-        try:
-            handler = AppleNotificationHandler(request.data)
-            handler.handle()
-        except Exception as e:
-            log.error(
-                "Unhandled App Store notification",
-                request_data=request.data,
-                exception=str(e),
-            )
+        StoreNotificationInboxService.enqueue(PaymentVendor.APPLE, request.data)
         view_response = ViewSuccessResponse()
         return view_response.rest_response
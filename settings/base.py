@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "corsheaders",
     "rest_framework",
     "django_filters",
@@ -136,6 +137,28 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTH_USER_MODEL = "authy.Account"
 
+# Hasher of ALGORITHM hashes new passwords, others only verify. Passwords hashed
+# with another algorithm or cost are rehashed on the next successful login. Use
+# "python manage.py benchmark_password_hashers" to size the cost per worker.
+PASSWORD_HASHING = {
+    "ALGORITHM": os.environ.get("PASSWORD_HASHING_ALGORITHM", "scrypt"),
+    "SCRYPT": {"WORK_FACTOR": 2**14, "BLOCK_SIZE": 8, "PARALLELISM": 1},
+    "ARGON2": {"TIME_COST": 2, "MEMORY_COST": 64 * 1024, "PARALLELISM": 1},
+    "PBKDF2": {"ITERATIONS": 600000},
+}
+
+_PASSWORD_HASHERS = {
+    "scrypt": "authy.hashers.ScryptPasswordHasher",
+    "argon2": "authy.hashers.Argon2PasswordHasher",  # requires argon2-cffi
+    "pbkdf2": "authy.hashers.PBKDF2PasswordHasher",
+}
+
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHING["ALGORITHM"]]] + [
+    path
+    for algorithm, path in _PASSWORD_HASHERS.items()
+    if algorithm != PASSWORD_HASHING["ALGORITHM"]
+]
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -178,6 +201,15 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.BasicAuthentication",
     ),
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    "DEFAULT_RENDERER_CLASSES": (
+        "common.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "common.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "EXCEPTION_HANDLER": "common.exception_handling.custom_exception_handler.custom_exception_handler",
     "PAGE_SIZE": 100,
 }
@@ -209,6 +241,89 @@ SIMPLE_JWT = {
     "TOKEN_TYPE_CLAIM": "token_type",
 }
 
+STATELESS_AUTHENTICATION = {
+    # Opt in to authy.authentication.StatelessJWTAuthentication, which builds
+    # request.user from the access token claims instead of loading the account.
+    # It replaces JWTAuthentication only, session and basic auth are kept.
+    "ENABLED": os.environ.get("STATELESS_AUTHENTICATION_ENABLED") == "true",
+    "REVOCATION_CHECK": True,
+    "REVOCATION_CACHE_ALIAS": "default",
+    "REVOCATION_CACHE_TIMEOUT": 60,  # seconds a deactivated account may still pass
+}
+
+if STATELESS_AUTHENTICATION["ENABLED"]:
+    REST_FRAMEWORK["DEFAULT_AUTHENTICATION_CLASSES"] = (
+        "authy.authentication.StatelessJWTAuthentication",
+        *REST_FRAMEWORK["DEFAULT_AUTHENTICATION_CLASSES"][1:],
+    )
+
+SUBSCRIPTION_SNAPSHOT_CACHE = {
+    # Snapshots are read on token refresh by any process, so they are only cached
+    # in a shared cache. Without an alias they are loaded with one values() query.
+    "CACHE_ALIAS": os.environ.get("SUBSCRIPTION_SNAPSHOT_CACHE_ALIAS"),
+    "TIMEOUT": 60 * 60,  # seconds, UserSubscription saves invalidate earlier
+}
+
+OUTBOUND_HTTP = {
+    # Pooled clients of utils.http_clients, HOSTS overrides DEFAULT per base url
+    "DEFAULT": {
+        "HTTP2": True,  # requires h2, installed through httpx[http2]
+        "MAX_CONNECTIONS": 10,  # per host and process
+        "MAX_KEEPALIVE_CONNECTIONS": 5,
+        "KEEPALIVE_EXPIRY": 30,  # seconds
+        "TIMEOUT": 10,  # seconds
+        "CONNECT_TIMEOUT": 5,  # seconds
+    },
+    "HOSTS": {
+        # Keeps the 5 second timeout NetGSM calls had with module-level httpx.get
+        "https://api.netgsm.com.tr": {"TIMEOUT": 5},
+    },
+}
+
+STORE_NOTIFICATION_INBOX = {
+    "WORKERS": 2,  # threads of process_store_notifications
+    "BATCH_SIZE": 10,  # notifications claimed at once by a worker
+    "LEASE_TIMEOUT": 300,  # seconds before a crashed worker's claim is released
+    "POLL_INTERVAL": 1.0,  # seconds to wait when the inbox is empty
+    "MAX_ATTEMPTS": 8,  # failures after which a notification is marked dead
+    "BACKOFF_BASE": 30,  # seconds before the first retry, doubled per attempt
+    "BACKOFF_MAX": 3600,  # seconds
+}
+
+LOGIN_PIPELINE = {
+    "DEFER_LAST_LOGIN_UPDATE": True,  # update last_login after the response
+}
+
+LOG_PIPELINE = {
+    "ASYNC": True,
+    "MAX_QUEUE_SIZE": 10000,
+    "BATCH_SIZE": 200,
+    "FLUSH_INTERVAL": 0.5,  # seconds
+    "HIGH_WATERMARK": 0.8,  # share of the queue after which success logs are sampled
+    "PRESSURE_SAMPLE_RATE": 0.1,
+}
+
+LOG_SAMPLING = {
+    "DEFAULT_SAMPLE_RATE": 1.0,  # share of successful requests that are logged
+    "MAX_PAYLOAD_SIZE": 4096,  # characters of a serialized request body
+    "VIEWS": {
+        "TranslationViewSet.list": {"SAMPLE_RATE": 0.01},
+        "TranslationViewSet.retrieve": {"SAMPLE_RATE": 0.05},
+    },
+}
+
+TRANSLATION_CACHE = {
+    "LOCAL_MAX_SIZE": 10000,
+    "LOCAL_TIMEOUT": 60,  # seconds, bounds staleness across workers
+    "SHARED_CACHE_ALIAS": os.environ.get("TRANSLATION_SHARED_CACHE_ALIAS"),
+    "SHARED_TIMEOUT": 60 * 60,
+}
+
+LOCALE_REGISTRY = {
+    "TIMEOUT": 5 * 60,  # seconds, bounds staleness across workers
+    "RELOAD_ON_MISS_INTERVAL": 5,
+}
+
 IDRIVE_ENDPOINT_URL = os.environ.get("IDRIVE_ENDPOINT_URL")
 IDRIVE_ACCESS_KEY = os.environ.get("IDRIVE_ACCESS_KEY")
 IDRIVE_SECRET_ACCESS_KEY = os.environ.get("IDRIVE_SECRET_ACCESS_KEY")
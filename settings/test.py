@@ -16,3 +16,15 @@ CORS_ALLOWED_ORIGINS = [
 SECRET_KEY = os.environ.get("SECRET_KEY")
 
 SIMPLE_JWT["SIGNING_KEY"] = os.environ.get("SECRET_KEY")
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "shared": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get("REDIS_URL"),
+        },
+    }
+    SUBSCRIPTION_SNAPSHOT_CACHE["CACHE_ALIAS"] = (
+        SUBSCRIPTION_SNAPSHOT_CACHE["CACHE_ALIAS"] or "shared"
+    )
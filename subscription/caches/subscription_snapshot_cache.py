@@ -0,0 +1,181 @@
+import datetime
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Case, When, Value, CharField, QuerySet, Subquery
+from django.db.models.functions import JSONObject
+
+from payment.types import SubscriptionPeriod, BuyableType
+from subscription.types import SubscriptionStatus
+
+SNAPSHOT_FIELDS = (
+    "id",
+    "user_id",
+    "expiration_date",
+    "start_date",
+    "status",
+    "buyable__period",
+    "buyable__type",
+    "used_trial_days",
+    "created",
+    "updated",
+    "deleted_at",
+)
+SNAPSHOT_DATETIME_FIELDS = (
+    "expiration_date",
+    "start_date",
+    "created",
+    "updated",
+    "deleted_at",
+)
+
+
+def get_effective_status(
+    status: str,
+    start_date: datetime.datetime,
+    expiration_date: datetime.datetime,
+    now: datetime.datetime = None,
+) -> str:
+    """
+    Status UserSubscription.current_status would settle on, without saving it
+    """
+    now = now or datetime.datetime.utcnow()
+    if expiration_date < now and status != SubscriptionStatus.EXPIRED:
+        status = SubscriptionStatus.EXPIRED
+    if start_date > now and status != SubscriptionStatus.INITIAL:
+        status = SubscriptionStatus.INITIAL
+    if status == SubscriptionStatus.INITIAL and start_date < now < expiration_date:
+        status = SubscriptionStatus.ACTIVE
+    return status
+
+
+def snapshot_from_json(snapshot_json: Optional[Dict]) -> Optional[Dict]:
+    """
+    Snapshot read through SubscriptionSnapshotCache.subquery, whose datetimes
+    are serialized by the database
+    """
+    if snapshot_json is None:
+        return None
+    return {
+        **snapshot_json,
+        **{
+            field: (
+                datetime.datetime.fromisoformat(snapshot_json[field])
+                if snapshot_json[field] is not None
+                else None
+            )
+            for field in SNAPSHOT_DATETIME_FIELDS
+        },
+    }
+
+
+def snapshot_to_json(snapshot: Dict) -> Dict:
+    """
+    Same shape as UserSubscription.safe_json
+    """
+    return {
+        "id": snapshot["id"],
+        "user_id": str(snapshot["user_id"]),
+        "expiration_date": str(snapshot["expiration_date"]),
+        "start_date": str(snapshot["start_date"]),
+        "status": get_effective_status(
+            snapshot["status"], snapshot["start_date"], snapshot["expiration_date"]
+        ),
+        "period": snapshot["buyable__period"] or SubscriptionPeriod.MONTHLY.value,
+        "type": snapshot["buyable__type"] or BuyableType.PERSONAL_SUBSCRIPTION.value,
+        "used_trial_days": snapshot["used_trial_days"],
+        "created": str(snapshot["created"]),
+        "updated": str(snapshot["updated"]),
+        "deleted_at": str(snapshot["deleted_at"]),
+    }
+
+
+class SubscriptionSnapshotCache:
+    """
+    Per user cache of the raw values of the last or active subscription, the
+    status is evaluated on read since it depends on time. Only a shared cache is
+    used, since saves in one process must invalidate the snapshot for all of
+    them. Without one, snapshots are loaded on every read.
+    """
+
+    KEY_PREFIX = "subscription_snapshot"
+
+    def __init__(self):
+        config = getattr(settings, "SUBSCRIPTION_SNAPSHOT_CACHE", {})
+        self.cache_alias = config.get("CACHE_ALIAS", None)
+        self.timeout = config.get("TIMEOUT", 60 * 60)
+
+    @property
+    def cache(self):
+        if not self.cache_alias:
+            return None
+        return caches[self.cache_alias]
+
+    def _key(self, user_id) -> str:
+        return f"{self.KEY_PREFIX}:{user_id}"
+
+    @staticmethod
+    def last_or_active_queryset(user_id) -> QuerySet:
+        """
+        Same ordering as User.last_or_active_subscription, user_id may be an
+        OuterRef to use it as a subquery
+        """
+        from subscription.models import UserSubscription  # Avoid circular imports
+
+        return (
+            UserSubscription.objects.filter(user_id=user_id)
+            .annotate(
+                priority=Case(
+                    When(status="active", then=Value(1)),
+                    default=Value(2),
+                    output_field=CharField(),
+                )
+            )
+            .order_by("priority", "-created")
+        )
+
+    @classmethod
+    def load(cls, user_id) -> Optional[Dict]:
+        return cls.last_or_active_queryset(user_id).values(*SNAPSHOT_FIELDS).first()
+
+    @classmethod
+    def subquery(cls, user_ref) -> Subquery:
+        """
+        Snapshot as a JSON object, to be annotated on user queries and read back
+        through snapshot_from_json
+        """
+        return Subquery(
+            cls.last_or_active_queryset(user_ref).values(
+                snapshot=JSONObject(**{field: field for field in SNAPSHOT_FIELDS})
+            )[:1]
+        )
+
+    def get(self, user_id) -> Optional[Dict]:
+        cache = self.cache
+        if cache is None:
+            return self.load(user_id)
+        # Snapshots are wrapped so that users without subscriptions are cached too
+        cached = cache.get(self._key(user_id), None)
+        if cached is not None:
+            return cached[0]
+        snapshot = self.load(user_id)
+        self.set(user_id, snapshot)
+        return snapshot
+
+    def set(self, user_id, snapshot: Optional[Dict]):
+        cache = self.cache
+        if cache is not None:
+            cache.set(self._key(user_id), (snapshot,), timeout=self.timeout)
+
+    def get_json(self, user_id) -> Optional[Dict]:
+        snapshot = self.get(user_id)
+        return snapshot_to_json(snapshot) if snapshot is not None else None
+
+    def invalidate(self, user_id):
+        cache = self.cache
+        if cache is not None:
+            cache.delete(self._key(user_id))
+
+
+subscription_snapshot_cache = SubscriptionSnapshotCache()
@@ -1,17 +1,31 @@
 import datetime
 
 from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from structlog import get_logger
 
 from payment.signals import purchase_for_subscription_created
 from payment.types import BuyableType, SubscriptionPeriod
+from subscription.caches.subscription_snapshot_cache import (
+    subscription_snapshot_cache,
+)
 from subscription.models import UserSubscription
 from subscription.types import SubscriptionStatus
 
 log = get_logger(__name__)
 
 
+@receiver(post_save, sender=UserSubscription)
+@receiver(post_delete, sender=UserSubscription)
+def handle_user_subscription_change(sender, instance, **kwargs):
+    # Drop again after commit since other requests may cache the old state before it
+    user_id = instance.user_id
+    subscription_snapshot_cache.invalidate(user_id)
+    transaction.on_commit(lambda: subscription_snapshot_cache.invalidate(user_id))
+
+
 @receiver(purchase_for_subscription_created, sender=None)
 def handle_user_subscription_create(sender, instance, product=None, **kwargs):
     # Create user subscription
@@ -1,5 +1,6 @@
 from rest_framework import permissions
 
+from common.permissions.principal import get_principal
 from user.types import UserRole
 
 
@@ -13,21 +14,17 @@ class UserViewSetPermission(permissions.BasePermission):
         Allow operations only to users themselves or upper roles than Editor
         """
 
-        auth = request.auth
-        if auth:
-            jwt_payload = auth.payload
-            role = UserRole(jwt_payload.get("role", None) or UserRole.NONE.value)
-            if role and (role > UserRole.EDITOR):
-                return True
-            elif (
-                role
-                and (role >= UserRole.EDITOR)
-                and view.action in ["list", "retrieve", "partial_update"]
-            ):
-                return True
+        principal = get_principal(request)
+        if not principal.is_authenticated:
+            return False
+        if principal.has_role(UserRole.ADMIN):
+            return True
+        if principal.has_role(UserRole.EDITOR) and view.action in [
+            "list",
+            "retrieve",
+            "partial_update",
+        ]:
+            return True
 
-            user_id = view.kwargs["user_id"]
-            if user_id and user_id == jwt_payload.get("user_id", None):
-                return True
-
-        return False
+        user_id = view.kwargs.get("user_id", None)
+        return bool(user_id) and principal.is_user(user_id)
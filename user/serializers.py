@@ -3,6 +3,7 @@ from rest_framework import serializers, status
 
 from common.custom_exceptions.custom_exception import CustomException
 from common.models import Translation
+from common.permissions.principal import get_principal
 from common.response.response_information_codes.error_code import ErrorCode
 from user.models import User, School, Class
 from user.types import UserRole
@@ -60,16 +61,12 @@ class UserPartialUpdateSerializer(serializers.ModelSerializer):
         if user is None:
             raise serializers.ValidationError("User not found!")
 
-        user_role = (
-            self.context.get("request").auth.payload.get("role", "none")
-            if self.context.get("request") and self.context.get("request").auth
-            else "none"
-        )
+        user_role = get_principal(self.context.get("request")).role
 
         if attrs.get("role", None) and (
-            UserRole(user_role) < UserRole.EDITOR
-            or UserRole(attrs.get("role", "none")) > UserRole(user_role)
-            or UserRole(user.role) > UserRole(user_role)
+            user_role < UserRole.EDITOR
+            or UserRole(attrs.get("role", "none")) > user_role
+            or UserRole(user.role) > user_role
         ):
             raise CustomException(
                 detail={"error": "You do not have permission to edit"},
@@ -101,10 +98,7 @@ class SchoolSerializer(serializers.ModelSerializer):
         Modify the output representation of the serializer to return name_id.
         """
         representation = super().to_representation(instance)
-        representation["name_id"] = instance.name.id if instance.name else None
-
-        if hasattr(instance, "translated_name") and instance.translated_name:
-            representation["name"] = instance.translated_name[0].text
+        representation["name_id"] = instance.name_id
         return representation
 
 
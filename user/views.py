@@ -1,6 +1,8 @@
-from django.http import Http404
+from typing import Dict, List
+
 from django.utils.translation import gettext_lazy as _
 from rest_framework import status
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
 from structlog import get_logger
 
@@ -10,11 +12,11 @@ from common.pagination import CustomPageNumberPagination
 from common.permissions.generic_permissions import (
     EditorAndUpOrReadOnly,
 )
+from common.response.envelope_response_mixin import EnvelopeResponseMixin
 from common.response.response_information_codes.message_code import MessageCode
 from common.response.view_response import (
     log_view_response,
     ViewResponse,
-    ViewResponseNoContent,
 )
 from user.models import User, School, Class, Avatar
 from user.permissions import UserViewSetPermission
@@ -35,7 +37,7 @@ log = get_logger(__name__)
 
 
 # Create your views here.
-class UserViewSet(ModelViewSet):
+class UserViewSet(EnvelopeResponseMixin, ModelViewSet):
     permission_classes = [UserViewSetPermission]
     pagination_class = CustomPageNumberPagination
     queryset = User.objects.all().select_related("school")
@@ -78,44 +80,6 @@ class UserViewSet(ModelViewSet):
 
         return queryset
 
-    def retrieve(self, request, *args, **kwargs):
-        response = super().retrieve(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.RETRIEVE_CONTENT_SUCCESS,
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="retrieve",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.LIST_CONTENT_SUCCESS,
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="list",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
     def partial_update(self, request, *args, **kwargs):
         status_code = status.HTTP_200_OK
         serializer = self.get_serializer(data=request.data)
@@ -124,46 +88,7 @@ class UserViewSet(ModelViewSet):
 
         user = UserService.update_user(data, True)
 
-        view_response = ViewResponse(
-            response_body=user,
-            response_status=status_code,
-            is_successful=True,
-            response_information_code=MessageCode.UPDATE_CONTENT_SUCCESS,
-            response_message=_("Updated successfully!"),
-        )
-
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="create",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-
-        return view_response.rest_response
-
-    def destroy(self, request, *args, **kwargs):
-        try:
-            super().destroy(request, *args, **kwargs)
-            view_response = ViewResponseNoContent(
-                response_message=_("Deleted successfully!")
-            )
-        except Http404:
-            view_response = ViewResponseNoContent(
-                response_message=_("Deleted successfully!")
-            )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="destroy",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
+        return Response(user, status=status_code)
 
 
 class AvatarViewSet(GenericViewSet):
@@ -189,9 +114,7 @@ class AvatarViewSet(GenericViewSet):
             struct_logger=log,
             view_name=self.__class__.__name__,
             method_name="create",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
+            request=request,
             view_response=view_response,
         )
 
@@ -211,16 +134,14 @@ class AvatarViewSet(GenericViewSet):
             struct_logger=log,
             view_name=self.__class__.__name__,
             method_name="list",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
+            request=request,
             view_response=view_response,
         )
 
         return view_response.rest_response
 
 
-class SchoolViewSet(ModelViewSet):
+class SchoolViewSet(EnvelopeResponseMixin, ModelViewSet):
     permission_classes = [EditorAndUpOrReadOnly]
     queryset = School.objects.all()
     lookup_field = "id"
@@ -230,117 +151,29 @@ class SchoolViewSet(ModelViewSet):
             return SchoolRetrieveSerializer
         return SchoolSerializer
 
-    def get_queryset(self):
-        queryset = School.objects.all()
-        language_code = GlobalContextMiddleware.get_global_context().language_code
-
-        return queryset.prefetch_related(
-            Translation.create_prefetch_for_language(
-                language_code, "name__translations", to_attr="translated_name"
-            )
+    @staticmethod
+    def localize_names(schools: List[Dict]) -> List[Dict]:
+        translation_id_text_map = Translation.get_list_of_texts_from_id_list(
+            [school.get("name_id") for school in schools],
+            GlobalContextMiddleware.get_global_context().language_code,
         )
+        return [
+            {**school, "name": translation_id_text_map.get(school.get("name_id"))}
+            for school in schools
+        ]
 
     def retrieve(self, request, *args, **kwargs):
         response = super().retrieve(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.RETRIEVE_CONTENT_SUCCESS,
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="retrieve",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
+        response.data = self.localize_names([response.data])[0]
+        return response
 
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.LIST_CONTENT_SUCCESS,
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="list",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
+        response.data = self.localize_names(response.data)
+        return response
 
-    def create(self, request, *args, **kwargs):
-        response = super().create(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.CREATE_CONTENT_SUCCESS,
-            response_message=_("Created successfully!"),
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="create",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def partial_update(self, request, *args, **kwargs):
-        response = super().partial_update(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.UPDATE_CONTENT_SUCCESS,
-            response_message=_("Updated successfully!"),
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="partial_update",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def destroy(self, request, *args, **kwargs):
-        try:
-            super().destroy(request, *args, **kwargs)
-            view_response = ViewResponseNoContent(
-                response_message=_("Deleted successfully!")
-            )
-        except Http404:
-            view_response = ViewResponseNoContent(
-                response_message=_("Deleted successfully!")
-            )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="destroy",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
 
-
-class ClassViewSet(ModelViewSet):
+class ClassViewSet(EnvelopeResponseMixin, ModelViewSet):
     permission_classes = [EditorAndUpOrReadOnly]
     serializer_class = ClassSerializer
     queryset = Class.objects.all()
@@ -357,102 +190,3 @@ class ClassViewSet(ModelViewSet):
             query_set = query_set.filter(school_id=school_id).select_related("school")
 
         return query_set
-
-    def retrieve(self, request, *args, **kwargs):
-        response = super().retrieve(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.RETRIEVE_CONTENT_SUCCESS,
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="retrieve",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.LIST_CONTENT_SUCCESS,
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="list",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def create(self, request, *args, **kwargs):
-        response = super().create(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.CREATE_CONTENT_SUCCESS,
-            response_message=_("Created successfully!"),
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="create",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def partial_update(self, request, *args, **kwargs):
-        response = super().partial_update(request, *args, **kwargs)
-        view_response = ViewResponse(
-            response_body=response.data,
-            response_status=response.status_code,
-            is_successful=True,
-            response_information_code=MessageCode.UPDATE_CONTENT_SUCCESS,
-            response_message=_("Updated successfully!"),
-        )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="partial_update",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
-
-    def destroy(self, request, *args, **kwargs):
-        try:
-            super().destroy(request, *args, **kwargs)
-            view_response = ViewResponseNoContent(
-                response_message=_("Deleted successfully!")
-            )
-        except Http404:
-            view_response = ViewResponseNoContent(
-                response_message=_("Deleted successfully!")
-            )
-        log_view_response(
-            struct_logger=log,
-            view_name=self.__class__.__name__,
-            method_name="destroy",
-            request_body=request.data,
-            request_path=request.get_full_path(),
-            request_method=request.method,
-            view_response=view_response,
-        )
-        return view_response.rest_response
@@ -1,17 +1,163 @@
 import base64
 import io
 import re
+import threading
+from collections import OrderedDict
 from decimal import Decimal
 from itertools import chain
-from typing import List, Dict, Union
+from typing import List, Dict, Iterable, Union
 
 from django.db import models
-from django.db.models import QuerySet
+from django.db.models import QuerySet, prefetch_related_objects
 
 from utils.constants.environment_variables import EXTENSION_MAPPER
 
 
+class ModelConversionPlan:
+    """
+    Accessors of a model_to_dict call computed once per model and arguments
+    """
+
+    VALUE = 0
+    DETAILED_FOREIGN_KEY = 1
+    RELATED_IDS = 2
+    DETAILED_RELATED = 3
+
+    def __init__(
+        self,
+        model,
+        fields: List = None,
+        exclude: List = None,
+        detailed_fields: Dict[str, Dict[str, Union[List, Dict]]] = None,
+        fields_as: Dict[str, str] = None,
+    ):
+        def get_reflected_name(field_name: str):
+            return fields_as.get(field_name, field_name) if fields_as else field_name
+
+        opts = model._meta
+        fields = (
+            fields + list(detailed_fields.keys())
+            if isinstance(detailed_fields, dict) and isinstance(fields, List)
+            else fields
+        )
+        fields = set(fields) if fields is not None else None
+        exclude = set(exclude) if exclude else set()
+        detailed_fields = detailed_fields or {}
+
+        self.steps = []
+        self.prefetch_lookups = []
+        for f in chain(opts.concrete_fields, opts.private_fields):
+            if (fields and f.name not in fields) or f.name in exclude:
+                continue
+            if type(f) == models.ForeignKey and f.name in detailed_fields:
+                self._add_detailed_step(
+                    self.DETAILED_FOREIGN_KEY,
+                    get_reflected_name(f.name),
+                    f.name,
+                    None,
+                    ModelConverter.get_plan(f.related_model, **detailed_fields[f.name]),
+                )
+            else:
+                self.steps.append(
+                    (
+                        self.VALUE,
+                        get_reflected_name(f.name),
+                        f.value_from_object,
+                        None,
+                        None,
+                    )
+                )
+        for f in opts.many_to_many:
+            if (fields and f.name not in fields) or f.name in exclude:
+                continue
+            if f.name in detailed_fields:
+                self._add_detailed_step(
+                    self.DETAILED_RELATED,
+                    get_reflected_name(f.name),
+                    f.name,
+                    f.name,
+                    ModelConverter.get_plan(f.related_model),
+                )
+            else:
+                self.steps.append(
+                    (self.RELATED_IDS, get_reflected_name(f.name), f.name, f.name, None)
+                )
+                self.prefetch_lookups.append(f.name)
+        for f in opts.related_objects:
+            if fields is None or f.name not in fields or f.name in exclude:
+                continue
+            accessor = f.get_accessor_name()
+            cache_name = (
+                f.field.related_query_name() if f.many_to_many else f.get_cache_name()
+            )
+            if f.name in detailed_fields:
+                self._add_detailed_step(
+                    self.DETAILED_RELATED,
+                    get_reflected_name(f.name),
+                    accessor,
+                    cache_name,
+                    ModelConverter.get_plan(f.related_model, **detailed_fields[f.name]),
+                )
+            else:
+                self.steps.append(
+                    (
+                        self.RELATED_IDS,
+                        get_reflected_name(f.name),
+                        accessor,
+                        cache_name,
+                        None,
+                    )
+                )
+                self.prefetch_lookups.append(accessor)
+
+    def _add_detailed_step(self, kind, name, accessor, cache_name, plan):
+        self.steps.append((kind, name, accessor, cache_name, plan))
+        self.prefetch_lookups.append(accessor)
+        self.prefetch_lookups.extend(
+            f"{accessor}__{lookup}" for lookup in plan.prefetch_lookups
+        )
+
+    @staticmethod
+    def get_related_objects(instance: models.Model, accessor: str, cache_name: str):
+        """
+        Returns prefetched objects of the relation if any, otherwise queries them
+        """
+        prefetched_objects = getattr(instance, "_prefetched_objects_cache", None)
+        if prefetched_objects is not None and cache_name in prefetched_objects:
+            return prefetched_objects[cache_name]
+        if instance.pk is None:
+            return []
+        return getattr(instance, accessor).all()
+
+    def convert(self, instance: models.Model) -> Dict:
+        if instance is None:
+            return {}
+        data = {}
+        for kind, name, accessor, cache_name, plan in self.steps:
+            if kind == self.VALUE:
+                data[name] = accessor(instance)
+            elif kind == self.DETAILED_FOREIGN_KEY:
+                data[name] = plan.convert(getattr(instance, accessor))
+            elif kind == self.RELATED_IDS:
+                data[name] = [
+                    i.id
+                    for i in self.get_related_objects(instance, accessor, cache_name)
+                ]
+            else:
+                data[name] = [
+                    plan.convert(i)
+                    for i in self.get_related_objects(instance, accessor, cache_name)
+                ]
+        return data
+
+
 class ModelConverter:
+    # Plans are keyed by model and field arguments, so ad hoc field lists are
+    # evicted least recently used first
+    PLAN_CACHE_SIZE = 512
+    _plans = OrderedDict()
+    _plans_lock = threading.Lock()
+
     @staticmethod
     def _get_new_field_name(fields: List, name: str) -> str:
         new_name = name.replace("__", "_")
@@ -19,6 +165,52 @@ class ModelConverter:
             name = new_name
         return name
 
+    @staticmethod
+    def _freeze(value):
+        if isinstance(value, dict):
+            return tuple(
+                sorted(
+                    (key, ModelConverter._freeze(item)) for key, item in value.items()
+                )
+            )
+        if isinstance(value, (list, tuple, set)):
+            return tuple(ModelConverter._freeze(item) for item in value)
+        return value
+
+    @staticmethod
+    def get_plan(
+        model,
+        fields: List = None,
+        exclude: List = None,
+        detailed_fields: Dict[str, Dict[str, Union[List, Dict]]] = None,
+        fields_as: Dict[str, str] = None,
+    ) -> ModelConversionPlan:
+        key = (
+            model,
+            ModelConverter._freeze(fields),
+            ModelConverter._freeze(exclude),
+            ModelConverter._freeze(detailed_fields),
+            ModelConverter._freeze(fields_as),
+        )
+        with ModelConverter._plans_lock:
+            plan = ModelConverter._plans.get(key, None)
+            if plan is not None:
+                ModelConverter._plans.move_to_end(key)
+                return plan
+        # Built outside the lock, plans of detailed fields are looked up recursively
+        plan = ModelConversionPlan(
+            model,
+            fields=fields,
+            exclude=exclude,
+            detailed_fields=detailed_fields,
+            fields_as=fields_as,
+        )
+        with ModelConverter._plans_lock:
+            ModelConverter._plans[key] = plan
+            while len(ModelConverter._plans) > ModelConverter.PLAN_CACHE_SIZE:
+                ModelConverter._plans.popitem(last=False)
+        return plan
+
     @staticmethod
     def model_to_dict(
         instance: models.Model,
@@ -36,64 +228,51 @@ class ModelConverter:
                    i.e. book has one_to_many rel to book_progresses. Add fields=['progresses']
                    to see progresses listed in results
         """
-
-        def get_reflected_name(field_name: str):
-            return fields_as.get(field_name, field_name) if fields_as else field_name
-
         if instance is None:
             return {}
-        opts = instance._meta
-        data = {}
-        fields = (
-            fields + list(detailed_fields.keys())
-            if isinstance(detailed_fields, dict) and isinstance(fields, List)
-            else fields
-        )
-        for f in chain(opts.concrete_fields, opts.private_fields):
-            if fields and f.name not in fields:
-                continue
-            if exclude and f.name in exclude:
-                continue
-            if (
-                type(f) == models.ForeignKey
-                and detailed_fields
-                and f.name in detailed_fields.keys()
-            ):
-                data[get_reflected_name(f.name)] = ModelConverter.model_to_dict(
-                    instance.__getattribute__(f.name), **detailed_fields[f.name]
-                )
-            else:
-                data[get_reflected_name(f.name)] = f.value_from_object(instance)
-        for f in opts.many_to_many:
-            if fields and f.name not in fields:
-                continue
-            if exclude and f.name in exclude:
-                continue
-            if detailed_fields and f.name in detailed_fields.keys():
-                data[get_reflected_name(f.name)] = [
-                    ModelConverter.model_to_dict(i)
-                    for i in f.value_from_object(instance)
-                ]
-            else:
-                data[get_reflected_name(f.name)] = [
-                    i.id for i in f.value_from_object(instance)
-                ]
-        for f in opts.related_objects:
-            if fields is None or f.name not in fields:
-                continue
-            if exclude and f.name in exclude:
-                continue
+        return ModelConverter.get_plan(
+            type(instance),
+            fields=fields,
+            exclude=exclude,
+            detailed_fields=detailed_fields,
+            fields_as=fields_as,
+        ).convert(instance)
 
-            if detailed_fields and f.name in detailed_fields.keys():
-                data[get_reflected_name(f.name)] = [
-                    ModelConverter.model_to_dict(i, **detailed_fields[f.name])
-                    for i in instance.__getattribute__(f.name).all()
-                ]
+    @staticmethod
+    def models_to_dicts(
+        instances: Union[QuerySet, Iterable[models.Model]],
+        fields: List = None,
+        exclude: List = None,
+        detailed_fields: Dict[str, Dict[str, Union[List, Dict]]] = None,
+        fields_as: Dict[str, str] = None,
+        prefetch: bool = True,
+    ) -> List[Dict]:
+        """
+        Returns dicts of model instances of the same model like model_to_dict
+        When prefetch is set, many to many, reverse and detailed foreign key fields
+        are fetched for the whole batch at once instead of once per instance.
+        Relations already prefetched by the caller are not fetched again.
+        """
+        if isinstance(instances, QuerySet):
+            model = instances.model
+        else:
+            instances = [instance for instance in instances if instance is not None]
+            if not instances:
+                return []
+            model = type(instances[0])
+        plan = ModelConverter.get_plan(
+            model,
+            fields=fields,
+            exclude=exclude,
+            detailed_fields=detailed_fields,
+            fields_as=fields_as,
+        )
+        if prefetch and plan.prefetch_lookups:
+            if isinstance(instances, QuerySet):
+                instances = instances.prefetch_related(*plan.prefetch_lookups)
             else:
-                data[get_reflected_name(f.name)] = [
-                    i.id for i in instance.__getattribute__(f.name).all()
-                ]
-        return data
+                prefetch_related_objects(instances, *plan.prefetch_lookups)
+        return [plan.convert(instance) for instance in instances]
 
     @staticmethod
     def model_queryset_to_dict_queryset(
@@ -121,8 +300,7 @@ class ModelConverter:
         if queryset is None:
             return {}
         result = {}
-        for model in queryset:
-            model_dict = ModelConverter.model_to_dict(model)
+        for model_dict in ModelConverter.models_to_dicts(queryset):
             result[model_dict[desired_key]] = model_dict
 
         return result
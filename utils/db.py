@@ -0,0 +1,31 @@
+from typing import Optional
+
+from django.db import IntegrityError
+
+# Postgres truncates identifiers longer than this, constraint names included
+POSTGRES_MAX_IDENTIFIER_LENGTH = 63
+UNIQUE_VIOLATION_PGCODE = "23505"
+
+
+def get_integrity_error_constraint_name(error: IntegrityError) -> Optional[str]:
+    diag = getattr(error.__cause__, "diag", None)
+    return getattr(diag, "constraint_name", None)
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    pgcode = getattr(error.__cause__, "pgcode", None)
+    if pgcode is not None:
+        return pgcode == UNIQUE_VIOLATION_PGCODE
+    return "duplicate key" in str(error)
+
+
+def violates_constraint(error: IntegrityError, constraint_name: str) -> bool:
+    """
+    Whether the error is raised by the given constraint, falls back to searching
+    the message when the driver does not provide diagnostics
+    """
+    constraint_name = constraint_name[:POSTGRES_MAX_IDENTIFIER_LENGTH]
+    violated_constraint_name = get_integrity_error_constraint_name(error)
+    if violated_constraint_name is not None:
+        return violated_constraint_name == constraint_name
+    return constraint_name in str(error)
@@ -0,0 +1,84 @@
+import atexit
+import importlib.util
+import os
+import threading
+from typing import Dict, Optional
+
+import httpx
+from django.conf import settings
+
+# HTTP/2 is negotiated only when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class HTTPClientRegistry:
+    """
+    Process-wide pooled httpx clients keyed by base url, so connections are kept
+    alive and reused across requests. Pools are rebuilt after a fork, since
+    sockets of the parent can't be shared.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.Client] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    @staticmethod
+    def get_config(base_url: str) -> Dict:
+        config = getattr(settings, "OUTBOUND_HTTP", {})
+        return {
+            **config.get("DEFAULT", {}),
+            **config.get("HOSTS", {}).get(base_url, {}),
+        }
+
+    def create_client(self, base_url: str) -> httpx.Client:
+        config = self.get_config(base_url)
+        return httpx.Client(
+            base_url=base_url,
+            http2=config.get("HTTP2", True) and HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=config.get("MAX_CONNECTIONS", 10),
+                max_keepalive_connections=config.get("MAX_KEEPALIVE_CONNECTIONS", 5),
+                keepalive_expiry=config.get("KEEPALIVE_EXPIRY", 30),
+            ),
+            timeout=httpx.Timeout(
+                config.get("TIMEOUT", 10), connect=config.get("CONNECT_TIMEOUT", 5)
+            ),
+        )
+
+    def get(self, base_url: str) -> httpx.Client:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._clients = {}
+                    self._pid = os.getpid()
+        client = self._clients.get(base_url, None)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(base_url, None)
+                if client is None:
+                    client = self.create_client(base_url)
+                    self._clients[base_url] = client
+        return client
+
+    def close_all(self):
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        for client in clients.values():
+            client.close()
+
+
+http_clients = HTTPClientRegistry()
+atexit.register(http_clients.close_all)
+
+
+def get_http_client(base_url: str) -> httpx.Client:
+    return http_clients.get(base_url)
+
+
+def get_timeout(timeout: Optional[float]):
+    """
+    Per call timeout, None falls back to the timeout of the client instead of
+    disabling it as httpx would
+    """
+    return timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT